@@ -2,6 +2,7 @@ import logging
 import time
 from typing import List, Dict, Optional, Tuple
 import re
+from functools import lru_cache
 from plant_operations import get_plant_data, find_plant_by_id_or_name, update_plant_field
 from config import openai_client
 from field_config import get_canonical_field_name, is_valid_field, get_all_field_names
@@ -11,15 +12,14 @@ from conversation_manager import ConversationManager
 
 logger = logging.getLogger(__name__)
 
-# Initialize the conversation manager for chat responses (lazy initialization)
-_conversation_manager = None
+# Resolve the OpenAI completion method once instead of walking client.chat.completions on every request
+_openai_create = openai_client.chat.completions.create
 
+# Initialize the conversation manager for chat responses (lazy initialization)
+@lru_cache(maxsize=1)
 def get_conversation_manager():
-    """Get the conversation manager instance (lazy initialization)"""
-    global _conversation_manager
-    if _conversation_manager is None:
-        _conversation_manager = ConversationManager()
-    return _conversation_manager
+    """Get the conversation manager instance (lazy initialization, memoized after the first call)"""
+    return ConversationManager()
 
 # Phase 1: Import query analyzer (new functionality)
 try:
@@ -413,7 +413,7 @@ User question: {original_message}
 Please provide a helpful, informative response that addresses the user's question."""
     
     try:
-        response = openai_client.chat.completions.create(
+        response = _openai_create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -747,7 +747,7 @@ Return ONLY the JSON array, no other text:
 """
         
         # Call OpenAI for location matching
-        response = openai_client.chat.completions.create(
+        response = _openai_create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a gardening assistant that matches user queries to valid garden locations. Be flexible with partial matches and return only JSON arrays."},
@@ -932,16 +932,7 @@ def get_chat_response_with_analyzer(message: str) -> str:
     
     try:
         # Check for location-based plant queries first (AI-driven approach)
-        msg_lower = message.lower()
-        location_patterns = [
-            'what plants are in', 'how many plants in', 'show me plants in',
-            'plants in the', 'plants in', 'what\'s in the', 'whats in the',
-            'how many different plants in', 'list plants in', 'plants located in'
-        ]
-        
-        is_location_plants_query = any(pattern in msg_lower for pattern in location_patterns)
-        
-        if is_location_plants_query:
+        if get_chat_route(message) == 'location_plants':
             logger.info(f"Detected location-based plant query: {message}")
             return handle_location_plants_query_with_ai(message)
         
@@ -1012,7 +1003,7 @@ def get_chat_response_legacy(message: str) -> str:
             ]
             logger.debug("Weather context not available for legacy chat response")
 
-        response = openai_client.chat.completions.create(
+        response = _openai_create(
             model="gpt-3.5-turbo",
             messages=messages,
             temperature=0.7,
@@ -1076,6 +1067,28 @@ def process_query_with_pipeline(message: str) -> str:
             logger.error(f"Phase 5: Legacy method also failed: {legacy_error}")
             return "I apologize, but I'm experiencing technical difficulties. Please try again in a moment."
 
+# Phrases that route a chat message straight to the location-plants handler
+LOCATION_PLANT_PATTERNS = (
+    'what plants are in', 'how many plants in', 'show me plants in',
+    'plants in the', 'plants in', 'what\'s in the', 'whats in the',
+    'how many different plants in', 'list plants in', 'plants located in'
+)
+
+def get_chat_route(message: str) -> str:
+    """
+    Name the handler stage a chat message is routed to, without calling the LLM.
+    
+    Args:
+        message (str): User's query message
+    
+    Returns:
+        str: 'location_plants' for location-based plant queries, otherwise 'query_analyzer'
+    """
+    msg_lower = message.lower()
+    if any(pattern in msg_lower for pattern in LOCATION_PLANT_PATTERNS):
+        return 'location_plants'
+    return 'query_analyzer'
+
 def get_chat_response_with_analyzer_optimized(message: str, conversation_id: Optional[str] = None) -> str:
     """
     Optimized version of chat response with analyzer, including performance monitoring and conversation history.
@@ -1097,16 +1110,7 @@ def get_chat_response_with_analyzer_optimized(message: str, conversation_id: Opt
             logger.info(f"Phase 2: Added user message to conversation {conversation_id}")
         
         # Check for location-based plant queries first (AI-driven approach)
-        msg_lower = message.lower()
-        location_patterns = [
-            'what plants are in', 'how many plants in', 'show me plants in',
-            'plants in the', 'plants in', 'what\'s in the', 'whats in the',
-            'how many different plants in', 'list plants in', 'plants located in'
-        ]
-        
-        is_location_plants_query = any(pattern in msg_lower for pattern in location_patterns)
-        
-        if is_location_plants_query:
+        if get_chat_route(message) == 'location_plants':
             logger.info(f"Phase 5: Detected location-based plant query: {message}")
             response = handle_location_plants_query_with_ai(message)
             # Add response to conversation history
@@ -1253,6 +1257,17 @@ def build_ai_context_with_plants(query_type: str, plant_references: List[str], m
         logger.error(f"Error building AI context: {e}")
         return "Location: Houston, Texas (Zone 9a)"
 
+def _api_message(msg: Dict) -> Dict:
+    """
+    Return a history message in the {role, content} shape the OpenAI API accepts.
+    
+    Messages already in that shape with string content are passed through as-is (the
+    SDK only reads them); anything else is rebuilt without its extra keys.
+    """
+    if len(msg) == 2 and isinstance(msg['content'], str):
+        return msg
+    return {"role": msg["role"], "content": str(msg["content"])}
+
 def generate_ai_response_with_context(query_type: str, context: str, message: str, conversation_id: Optional[str] = None) -> str:
     """
     Generate AI response with enhanced context and conversation history.
@@ -1278,22 +1293,15 @@ def generate_ai_response_with_context(query_type: str, context: str, message: st
         # Use Phase 4 mode-specific system prompt
         system_prompt = conversation_manager.get_mode_specific_system_prompt('database', conversation_context or {})
         
-        # Build messages array with conversation history if available
-        messages = [{"role": "system", "content": system_prompt}]
-        
         # Add conversation history if conversation_id provided
+        history = []
         if conversation_id:
             # Use weather-aware messages for enhanced context
             conversation_messages = conversation_manager.get_weather_aware_messages(conversation_id)
             if conversation_messages:
                 # Add conversation history (excluding the current user message)
-                for msg in conversation_messages[:-1]:  # Exclude the last message (current user message)
-                    # Ensure message has the correct structure
-                    if isinstance(msg, dict) and 'role' in msg and 'content' in msg:
-                        messages.append({
-                            "role": msg["role"],
-                            "content": str(msg["content"])
-                        })
+                history = [_api_message(msg) for msg in conversation_messages[:-1]
+                           if isinstance(msg, dict) and 'role' in msg and 'content' in msg]
                 logger.info(f"Phase 4: Added {len(conversation_messages)-1} weather-aware conversation history messages")
         
         # Add current user message with context
@@ -1302,10 +1310,12 @@ def generate_ai_response_with_context(query_type: str, context: str, message: st
 User Question: {message}
 
 Please provide a helpful, accurate response based on the context and user's question."""
-        messages.append({"role": "user", "content": user_prompt})
+        
+        # Build the messages array in one allocation: system prompt, history, current question
+        messages = [{"role": "system", "content": system_prompt}, *history, {"role": "user", "content": user_prompt}]
         
         # Make AI call
-        response = openai_client.chat.completions.create(
+        response = _openai_create(
             model="gpt-3.5-turbo",
             messages=messages,
             temperature=0.7,
@@ -1333,7 +1343,7 @@ def generate_fallback_ai_response(message: str) -> str:
         str: Simple AI response
     """
     try:
-        response = openai_client.chat.completions.create(
+        response = _openai_create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a helpful gardening assistant for Houston, Texas."},
@@ -5,6 +5,7 @@ Provides functions to retrieve climate context for prompts and logic.
 Every line is documented inline.
 """
 
+from functools import lru_cache
 from typing import Dict, Optional
 
 # Default climate location (Houston, TX, USA)
@@ -50,6 +51,22 @@ HOUSTON_CLIMATE = {
     'climate_summary': 'Hot and humid subtropical climate with mild winters, high humidity, and clay soil',
 }
 
+# Normalized (lowercased, stripped) names that resolve to Houston climate data.
+# Built once at import so location checks are a single set lookup.
+_HOUSTON_VARIATIONS = frozenset([
+    'houston, tx, usa',
+    'houston, tx',
+    'houston, texas, usa',
+    'houston, texas',
+    'houston',
+    'houston tx',
+    'houston texas'
+])
+
+def _normalize_location(location: Optional[str]) -> str:
+    """Return the lookup key for a location name (lowercased and stripped)."""
+    return (location or '').strip().lower()
+
 # Function to get the default climate location
 def get_default_location() -> str:
     """Return the default climate location (Houston, TX, USA)."""
@@ -72,27 +89,16 @@ def get_climate_params(location: Optional[str] = None) -> Dict[str, str]:
     if location is None:
         location = DEFAULT_LOCATION
     
-    # Normalize location for comparison
-    location_lower = location.lower().strip()
-    houston_variations = [
-        'houston, tx, usa',
-        'houston, tx',
-        'houston, texas, usa',
-        'houston, texas',
-        'houston',
-        'houston tx',
-        'houston texas'
-    ]
-    
     # Check if the location is a Houston variation
-    if location_lower in houston_variations:
+    if _normalize_location(location) in _HOUSTON_VARIATIONS:
         return HOUSTON_CLIMATE.copy()
     else:
         # For now, return Houston climate as default
         # In the future, this could return climate for other locations
         return HOUSTON_CLIMATE.copy()
 
-# Function to get climate context for AI prompts
+# Function to get climate context for AI prompts (memoized: the output only depends on location)
+@lru_cache(maxsize=16)
 def get_climate_context(location: Optional[str] = None) -> str:
     """
     Get formatted climate context for use in AI prompts.
@@ -106,8 +112,8 @@ def get_climate_context(location: Optional[str] = None) -> str:
     # Get climate parameters for the location
     climate = get_climate_params(location)
     
-    # Build the climate context string
-    context_parts = [
+    # Build the climate context string in a single join
+    context_parts = (
         f"Location: {location or DEFAULT_LOCATION}",
         f"Climate: {climate['temperature_description']}",
         f"Growing season: {climate['growing_seasons_description']}",
@@ -117,7 +123,7 @@ def get_climate_context(location: Optional[str] = None) -> str:
         f"Rainfall: {climate['rainfall_description']}",
         f"Soil: {climate['soil_description']}",
         f"Frost: {climate['frost_description']}"
-    ]
+    )
     
     return "\n".join(context_parts)
 
@@ -189,19 +195,7 @@ def is_location_supported(location: str) -> bool:
     Returns:
         bool: True if location is supported, False otherwise
     """
-    # Normalize location for comparison
-    location_lower = location.lower().strip()
-    houston_variations = [
-        'houston, tx, usa',
-        'houston, tx',
-        'houston, texas, usa',
-        'houston, texas',
-        'houston',
-        'houston tx',
-        'houston texas'
-    ]
-    
-    return location_lower in houston_variations
+    return _normalize_location(location) in _HOUSTON_VARIATIONS
 
 # Function to get all supported locations
 def get_supported_locations() -> list:
@@ -1,6 +1,11 @@
+import heapq
 import logging
+import re
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 import tiktoken
 import uuid
 
@@ -21,19 +26,236 @@ except ImportError:
     WEATHER_CONTEXT_AVAILABLE = False
     logger.warning("Weather context integration not available")
 
+@lru_cache(maxsize=4)
+def _get_encoder(model: str):
+    """Return the tiktoken encoder for a model, building it only once per process."""
+    return tiktoken.encoding_for_model(model)
+
+# Keyword vocabularies used to build conversation previews (order sets display priority)
+_PREVIEW_PLANT_KEYWORDS = ('tomato', 'pepper', 'herb', 'flower', 'tree', 'shrub', 'rose', 'lily', 'daisy', 'mint', 'basil', 'oregano', 'sage', 'thyme', 'rosemary', 'lavender', 'succulent', 'cactus', 'fern', 'palm', 'oak', 'maple', 'birch', 'willow', 'cherry', 'apple', 'peach', 'plum', 'lemon', 'lime', 'orange', 'grape', 'strawberry', 'blueberry', 'raspberry', 'blackberry', 'cucumber', 'carrot', 'lettuce', 'spinach', 'kale', 'broccoli', 'cauliflower', 'onion', 'garlic', 'potato', 'sweet potato', 'corn', 'bean', 'pea', 'zucchini', 'squash', 'pumpkin', 'melon', 'watermelon')
+_PREVIEW_TOPIC_KEYWORDS = ('care', 'water', 'sun', 'soil', 'prune', 'fertilize', 'fertilizing', 'plant', 'grow', 'harvest', 'disease', 'pest', 'location', 'photo', 'picture', 'identify', 'diagnose', 'advice', 'tip', 'season', 'weather', 'climate', 'temperature', 'humidity', 'light', 'shade', 'full sun', 'partial shade', 'drought', 'flood', 'maintenance', 'repot', 'transplant', 'seed', 'seedling', 'mature', 'bloom', 'flower', 'fruit', 'vegetable', 'herb', 'annual', 'perennial')
+_PLANT_KEYWORD_SET = frozenset(_PREVIEW_PLANT_KEYWORDS)
+_TOPIC_KEYWORD_SET = frozenset(_PREVIEW_TOPIC_KEYWORDS)
+_PLANT_RANK = {keyword: rank for rank, keyword in enumerate(_PREVIEW_PLANT_KEYWORDS)}
+_TOPIC_RANK = {keyword: rank for rank, keyword in enumerate(_PREVIEW_TOPIC_KEYWORDS)}
+
+# Keywords reported as recent topics in cross-mode context summaries (order sets priority)
+_SUMMARY_TOPIC_KEYWORDS = ('tomato', 'pepper', 'herb', 'flower', 'tree', 'shrub', 'plant', 'garden', 'care', 'water', 'sun', 'soil', 'prune', 'fertilize')
+_CROSS_MODE_TOPIC_KEYWORDS = ('tomato', 'pepper', 'herb', 'flower', 'tree', 'shrub', 'vegetable')
+
+# Preview action labels in priority order, each with the phrases that trigger it
+_PREVIEW_ACTION_RULES = (
+    ('Plant added', ('add plant',)),
+    ('Plant updated', ('update',)),
+    ('Plant identification', ('identify', 'what is this')),
+    ('Care advice', ('care', 'how to')),
+    ('Location query', ('location', 'where')),
+    ('Photo request', ('photo', 'picture')),
+)
+_PREVIEW_KEYWORDS = tuple(dict.fromkeys(
+    _PREVIEW_PLANT_KEYWORDS + _PREVIEW_TOPIC_KEYWORDS
+    + tuple(trigger for _, triggers in _PREVIEW_ACTION_RULES for trigger in triggers)
+))
+
+# Mode-specific system prompt templates, filled in with recent conversation context
+_MODE_SYSTEM_PROMPTS = {
+    "image_analysis": """You are an expert plant identification specialist with deep knowledge of horticulture, plant health, and gardening practices. You can identify plants from images and provide detailed care information.
+
+Your expertise includes:
+- Plant identification from photos
+- Health assessment and disease diagnosis
+- Care recommendations for Houston, TX climate
+- Soil, water, light, and temperature requirements
+- Pruning, fertilizing, and maintenance advice
+
+Previous conversation context: {context}
+
+Always provide accurate, helpful information and ask for clarification if needed.""",
+    
+    "database": """You are a knowledgeable gardening assistant with access to the user's garden database. You can help with plant care, garden management, and provide personalized advice based on their specific plants and garden setup.
+
+Your capabilities include:
+- Accessing and querying the user's garden database
+- Providing care information for specific plants
+- Garden planning and plant recommendations
+- Seasonal care advice for Houston, TX climate
+- Troubleshooting plant issues
+
+Previous conversation context: {context}
+
+Always reference the user's actual garden data when possible and provide practical, actionable advice.""",
+    
+    "general": """You are a helpful gardening assistant that can work in multiple modes. You can help with plant identification, garden database queries, and general gardening advice.
+
+Previous conversation context: {context}
+
+Please provide helpful, accurate information and ask for clarification if needed."""
+}
+
+@lru_cache(maxsize=64)
+def _format_system_prompt(mode: str, context: str) -> str:
+    """Fill in a mode's system prompt; repeats (e.g. every conversation's first turn) reuse the string."""
+    return _MODE_SYSTEM_PROMPTS.get(mode, _MODE_SYSTEM_PROMPTS["general"]).format(context=context)
+
+def _trie_pattern(keywords) -> str:
+    """
+    Build a prefix-factored regex (a character trie) matching any of the keywords.
+    Each position costs one walk down the trie instead of one attempt per keyword, and the
+    greedy optional tails make the longest keyword on the path win.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End-of-keyword marker
+    
+    def render(node: Dict) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+    
+    return render(trie)
+
+# One compiled trie pattern covers plants, topics and action triggers. A zero-width lookahead is
+# tried at every position, so a single pass reports overlapping keywords; the `keyword` group holds
+# the longest keyword starting there, and the shorter keywords that prefix it ('pea' in 'peach')
+# come from _KEYWORD_PREFIXES. Plurals need no extra entries since matching is by substring.
+_KEYWORD_SCAN_RE = re.compile(f'(?=(?P<keyword>{_trie_pattern(_PREVIEW_KEYWORDS)}))')
+_KEYWORD_PREFIXES = {
+    keyword: tuple(other for other in _PREVIEW_KEYWORDS if keyword.startswith(other))
+    for keyword in _PREVIEW_KEYWORDS
+}
+
+@lru_cache(maxsize=2048)
+def _scan_keywords(text_lower: str) -> frozenset:
+    """
+    Return every preview keyword occurring (as a substring) in already-lowercased text.
+    Memoized per message text: previews rescan the whole history, so only new messages cost a scan.
+    """
+    found = set()
+    for match in _KEYWORD_SCAN_RE.finditer(text_lower):
+        found.update(_KEYWORD_PREFIXES[match.group('keyword')])
+    return frozenset(found)
+
+def _detect_action(found_keywords: frozenset) -> Optional[str]:
+    """Return the highest-priority action label triggered by the scanned keywords, if any."""
+    for label, triggers in _PREVIEW_ACTION_RULES:
+        if not found_keywords.isdisjoint(triggers):
+            return label
+    return None
+
+# Preview title templates, bound once so titles skip format-string parsing
+_TITLE_DEFAULT = "Garden conversation"
+_TITLE_ONE_PLANT = "About {}".format
+_TITLE_TWO_PLANTS = "About {}, {}".format
+_TITLE_MANY_PLANTS = "About {}, {} and {} more".format
+
+def _preview_title(plants_mentioned: List[str]) -> str:
+    """Return the preview title for the plants mentioned so far."""
+    if not plants_mentioned:
+        return _TITLE_DEFAULT
+    if len(plants_mentioned) == 1:
+        return _TITLE_ONE_PLANT(plants_mentioned[0])
+    if len(plants_mentioned) == 2:
+        return _TITLE_TWO_PLANTS(plants_mentioned[0], plants_mentioned[1])
+    return _TITLE_MANY_PLANTS(plants_mentioned[0], plants_mentioned[1], len(plants_mentioned) - 2)
+
+def _new_preview_state() -> Dict:
+    """Return empty running preview aggregates for a conversation."""
+    return {
+        'plants_mentioned': [],  # Plants in order of first mention
+        'plants_seen': set(),    # Mirrors plants_mentioned for O(1) "already seen" checks
+        'title': _TITLE_DEFAULT, # Recomputed only when a new plant is mentioned
+        'key_topics': [],        # Topics in order of first mention
+        'topics_seen': set(),    # Mirrors key_topics
+        'actions': set(),        # Distinct action labels
+        'last_user_message': "",
+        'last_ai_response': ""
+    }
+
+def _tail(items: deque, count: int) -> List:
+    """Return the last `count` items of a deque in order, touching only those items."""
+    tail = list(islice(reversed(items), count))
+    tail.reverse()
+    return tail
+
+def _lowercase_content(message: Dict) -> str:
+    """Return a message's text content lowercased, or '' for empty or non-text (e.g. image) content."""
+    content = message.get('content', '')
+    return content.lower() if isinstance(content, str) else ''
+
+def _absorb_preview_message(state: Dict, message: Dict, content_lower: str) -> None:
+    """Fold one message's plants, topics, actions and text into a conversation's preview state."""
+    if not content_lower:
+        return
+    content = message['content']
+    role = message.get('role', '')
+    
+    # Find every plant, topic and action keyword in one pass over the message
+    found_keywords = _scan_keywords(content_lower)
+    
+    # Extract plants mentioned
+    new_plants = (found_keywords & _PLANT_KEYWORD_SET) - state['plants_seen']
+    if new_plants:
+        state['plants_mentioned'].extend(sorted(new_plants, key=_PLANT_RANK.get))
+        state['plants_seen'] |= new_plants
+        state['title'] = _preview_title(state['plants_mentioned'])
+    
+    # Extract key topics (improved detection)
+    new_topics = (found_keywords & _TOPIC_KEYWORD_SET) - state['topics_seen']
+    if new_topics:
+        state['key_topics'].extend(sorted(new_topics, key=_TOPIC_RANK.get))
+        state['topics_seen'] |= new_topics
+    
+    # Extract actions
+    action = _detect_action(found_keywords)
+    if action:
+        state['actions'].add(action)
+    
+    # Store last messages for summary
+    if role == 'user':
+        state['last_user_message'] = content[:100] + "..." if len(content) > 100 else content
+    elif role == 'assistant':
+        state['last_ai_response'] = content[:100] + "..." if len(content) > 100 else content
+
 class ConversationManager:
     """
     Manages in-memory conversation history for AI chat sessions.
     Handles session storage, token counting, timeouts, and message trimming.
     """
-    def __init__(self):
+    def __init__(self, id_generator: Optional[Callable[[str], str]] = None,
+                 clock: Optional[Callable[[], datetime]] = None):
         self.conversations: Dict[str, Dict] = {}  # Stores all conversations by ID
-        self.encoding = tiktoken.encoding_for_model(MODEL_NAME)  # Token encoder for the model
+        # Optional mode -> conversation ID factory (e.g. a cheap counter in tests); production
+        # IDs default to the unguessable UUID-based format
+        self._id_generator = id_generator
+        # Optional source of the current time (e.g. a fake clock that tests advance past the
+        # timeout); defaults to datetime.now
+        self._clock = clock
+        self.encoding = _get_encoder(MODEL_NAME)  # Shared token encoder for the model
         self.conversation_timeout = timedelta(minutes=30)  # Timeout for inactive conversations
+        # Min-heap of (last_activity, conversation_id); entries are superseded lazily when a
+        # conversation is touched again, so expiry never needs a full scan
+        self._expiry_heap: List = []
+        # Previews by conversation ID, stored with the (message count, last activity) they were
+        # built from; any new message or other activity changes that key and forces a rebuild
+        self._preview_cache: Dict[str, Tuple[Tuple, Dict]] = {}
+        # Read-only message tuples by conversation ID, keyed the same way as previews, so repeat
+        # get_messages calls between new messages share one snapshot instead of copying the deque
+        self._messages_view: Dict[str, Tuple[Tuple, Tuple[Dict, ...]]] = {}
+
+    def _now(self) -> datetime:
+        """Return the current time from the injected clock, or datetime.now()."""
+        return self._clock() if self._clock is not None else datetime.now()
 
     def generate_conversation_id(self, mode: str = "general") -> str:
         """Generate a unique conversation ID with optional mode prefix."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if self._id_generator is not None:
+            return self._id_generator(mode)
+        timestamp = self._now().strftime("%Y%m%d_%H%M%S")
         unique_id = str(uuid.uuid4())[:8]  # Use first 8 characters of UUID for uniqueness
         mode_prefix = mode[:3] if mode else "gen"  # Use first 3 characters of mode
         return f"{mode_prefix}_{timestamp}_{unique_id}"
@@ -67,59 +289,135 @@ class ConversationManager:
         last_activity = self.conversations[conversation_id].get('last_activity')
         if not last_activity:
             return False  # No last activity timestamp
-        return datetime.now() - last_activity < self.conversation_timeout  # Check timeout
+        return self._now() - last_activity < self.conversation_timeout  # Check timeout
+
+    def _touch(self, conversation_id: str) -> None:
+        """Mark a conversation as active now and schedule its expiry check."""
+        now = self._now()
+        self.conversations[conversation_id]['last_activity'] = now
+        heapq.heappush(self._expiry_heap, (now, conversation_id))
+
+    def _expire_stale(self) -> int:
+        """Remove conversations whose most recent activity is older than the timeout."""
+        cutoff = self._now() - self.conversation_timeout
+        expired_count = 0
+        while self._expiry_heap and self._expiry_heap[0][0] < cutoff:
+            last_activity, conversation_id = heapq.heappop(self._expiry_heap)
+            conversation = self.conversations.get(conversation_id)
+            # Skip entries superseded by later activity or for already-cleared conversations
+            if conversation is None or conversation.get('last_activity') != last_activity:
+                continue
+            del self.conversations[conversation_id]
+            self._preview_cache.pop(conversation_id, None)
+            self._messages_view.pop(conversation_id, None)
+            expired_count += 1
+            logger.info(f"Removed expired conversation {conversation_id}")
+        return expired_count
 
     def add_message(self, conversation_id: str, message: Dict) -> None:
         """Add a message to the conversation, managing token limits and timeouts."""
+        self.add_messages(conversation_id, [message])
+
+    def add_messages(self, conversation_id: str, messages: List[Dict]) -> None:
+        """Add several messages to the conversation at once, in order.
+        
+        Expiry, activity tracking and token trimming run once for the whole batch
+        rather than once per message; the stored result is the same as adding them one by one.
+        """
+        if not messages:
+            return
+        self._expire_stale()
+        
         # Check if conversation exists but might be inactive
         if conversation_id in self.conversations:
-            # Conversation exists, just update activity and add message
-            logger.info(f"Adding message to existing conversation {conversation_id}")
-            self.conversations[conversation_id]['last_activity'] = datetime.now()
-            self.conversations[conversation_id]['messages'].append(message)
-            self.conversations[conversation_id]['metadata']['total_messages'] += 1
-            logger.info(f"Added message to existing conversation {conversation_id}. Total messages: {len(self.conversations[conversation_id]['messages'])}")
+            # Conversation exists, just update activity and add messages
+            logger.info(f"Adding {len(messages)} message(s) to existing conversation {conversation_id}")
+            self._touch(conversation_id)
         else:
             # Create new conversation
             logger.info(f"Creating new conversation {conversation_id}")
             self.conversations[conversation_id] = {
-                'messages': [],
-                'last_activity': datetime.now(),
+                'messages': deque(),      # deque so trimming near the front is O(1)
+                'token_counts': deque(),  # Token count per message, parallel to 'messages'
+                'total_tokens': 0,        # Running sum of 'token_counts'
+                'content_lower': deque(), # Lowercased text per message, parallel to 'messages'
+                'preview_state': _new_preview_state(),  # Preview aggregates, updated per message
+                'last_activity': self._now(),
                 'metadata': {
-                    'created_at': datetime.now(),
-                    'mode': message.get('mode', 'general'),
+                    'created_at': self._now(),
+                    'mode': messages[0].get('mode', 'general'),
                     'total_messages': 0
                 }
             }
-            self.conversations[conversation_id]['messages'].append(message)
-            self.conversations[conversation_id]['metadata']['total_messages'] += 1
-            logger.info(f"Created new conversation {conversation_id}. Total messages: {len(self.conversations[conversation_id]['messages'])}")
+            self._touch(conversation_id)
+        
+        # Count each message's tokens once; the running total avoids re-encoding history
+        conversation = self.conversations[conversation_id]
+        token_counts = [self._count_message_tokens(message) for message in messages]
+        # Lowercase once at ingestion; previews and context summaries reuse it
+        contents_lower = [_lowercase_content(message) for message in messages]
+        conversation['messages'].extend(messages)
+        conversation['token_counts'].extend(token_counts)
+        conversation['content_lower'].extend(contents_lower)
+        conversation['total_tokens'] += sum(token_counts)
+        conversation['metadata']['total_messages'] += len(messages)
+        preview_state = conversation['preview_state']
+        for message, content_lower in zip(messages, contents_lower):
+            _absorb_preview_message(preview_state, message, content_lower)
+        logger.info(f"Added {len(messages)} message(s) to conversation {conversation_id}. Total messages: {len(conversation['messages'])}")
         
         # Trim messages if token limit exceeded
-        while self._get_total_tokens(conversation_id) > (MAX_TOKENS - TOKEN_BUFFER):
-            if len(self.conversations[conversation_id]['messages']) > 2:
+        trimmed = False
+        while conversation['total_tokens'] > (MAX_TOKENS - TOKEN_BUFFER):
+            if len(conversation['messages']) > 2:
                 logger.info(f"Trimming conversation {conversation_id} due to token limit")
-                del self.conversations[conversation_id]['messages'][1]  # Remove oldest after system message
+                # Remove oldest after system message (O(1) on a deque: index 1 is next to the head)
+                del conversation['messages'][1]
+                removed_tokens = conversation['token_counts'][1]
+                del conversation['token_counts'][1]
+                del conversation['content_lower'][1]
+                conversation['total_tokens'] -= removed_tokens
+                trimmed = True
             else:
                 break  # Only two messages left, stop trimming
+        
+        # Trimming can drop a message's plants or topics, so rebuild the preview state from what remains
+        if trimmed:
+            preview_state = _new_preview_state()
+            for remaining, remaining_lower in zip(conversation['messages'], conversation['content_lower']):
+                _absorb_preview_message(preview_state, remaining, remaining_lower)
+            conversation['preview_state'] = preview_state
+        
+        # Drop the message snapshot and preview: a trim can leave the length unchanged within one clock tick
+        self._messages_view.pop(conversation_id, None)
+        self._preview_cache.pop(conversation_id, None)
 
     def _get_total_tokens(self, conversation_id: str) -> int:
         """Get the total number of tokens in a conversation."""
         if conversation_id not in self.conversations:
             return 0  # Conversation not found
-        return sum(self._count_message_tokens(msg) for msg in self.conversations[conversation_id]['messages'])
+        return self.conversations[conversation_id]['total_tokens']
 
-    def get_messages(self, conversation_id: str) -> List[Dict]:
-        """Retrieve all messages for a conversation if it's still active."""
+    def get_messages(self, conversation_id: str) -> Tuple[Dict, ...]:
+        """Retrieve all messages for a conversation if it's still active, as a read-only tuple."""
+        self._expire_stale()
         if not self._is_conversation_active(conversation_id):
             logger.info(f"Conversation {conversation_id} has timed out or doesn't exist")
             self.clear_conversation(conversation_id)  # Remove inactive conversation
-            return []  # Return empty list
-        messages = self.conversations.get(conversation_id, {}).get('messages', [])
+            return ()  # Return empty tuple
+        conversation = self.conversations[conversation_id]
+        # Reuse the snapshot while the conversation is unchanged; callers needing a list copy it
+        view_key = (len(conversation['messages']), conversation.get('last_activity'))
+        cached = self._messages_view.get(conversation_id)
+        if cached is not None and cached[0] == view_key:
+            messages = cached[1]
+        else:
+            messages = tuple(conversation['messages'])
+            self._messages_view[conversation_id] = (view_key, messages)
         logger.info(f"Retrieved {len(messages)} messages for conversation {conversation_id}")
         return messages
     
-    def get_weather_aware_messages(self, conversation_id: str) -> List[Dict]:
+    def get_weather_aware_messages(self, conversation_id: str) -> Sequence[Dict]:
         """
         Retrieve messages for a conversation with weather context injected.
         
@@ -127,7 +425,7 @@ class ConversationManager:
             conversation_id (str): The conversation ID
             
         Returns:
-            List[Dict]: Messages with weather context injected
+            Sequence[Dict]: Messages with weather context injected
         """
         messages = self.get_messages(conversation_id)
         
@@ -163,7 +461,7 @@ class ConversationManager:
         return {
             'exists': True,
             'active': is_active,
-            'messages': conversation.get('messages', []),
+            'messages': list(conversation.get('messages', [])),
             'metadata': conversation.get('metadata', {}),
             'total_tokens': self._get_total_tokens(conversation_id),
             'last_activity': conversation.get('last_activity'),
@@ -182,7 +480,7 @@ class ConversationManager:
         
         old_mode = self.conversations[conversation_id]['metadata'].get('mode', 'unknown')
         self.conversations[conversation_id]['metadata']['mode'] = new_mode
-        self.conversations[conversation_id]['last_activity'] = datetime.now()
+        self._touch(conversation_id)
         
         logger.info(f"Switched conversation {conversation_id} from {old_mode} to {new_mode}")
         return True
@@ -213,12 +511,21 @@ class ConversationManager:
         """Clear all data for a conversation."""
         if conversation_id in self.conversations:
             del self.conversations[conversation_id]  # Delete the conversation
+            self._preview_cache.pop(conversation_id, None)  # Drop its cached preview
+            self._messages_view.pop(conversation_id, None)  # Drop its message snapshot
             logger.info(f"Cleared conversation {conversation_id}")
 
+    def clear_all_conversations(self) -> None:
+        """Clear every conversation along with its expiry and preview bookkeeping."""
+        self.conversations.clear()
+        self._expiry_heap.clear()
+        self._preview_cache.clear()
+        self._messages_view.clear()
+
     def cleanup_expired_conversations(self) -> int:
         """Remove all expired conversations and return the count of removed conversations."""
         expired_count = 0  # Initialize counter for expired conversations
-        current_time = datetime.now()  # Get current time
+        current_time = self._now()  # Get current time
         
         # Create a list of conversation IDs to remove (to avoid modifying dict during iteration)
         to_remove = []  # List to store conversation IDs to remove
@@ -232,6 +539,8 @@ class ConversationManager:
         # Remove expired conversations
         for conversation_id in to_remove:
             del self.conversations[conversation_id]  # Remove from conversations dict
+            self._preview_cache.pop(conversation_id, None)  # Drop its cached preview
+            self._messages_view.pop(conversation_id, None)  # Drop its message snapshot
             logger.info(f"Removed expired conversation {conversation_id}")  # Log removal
         
         if expired_count > 0:
@@ -273,43 +582,6 @@ class ConversationManager:
 
     def get_mode_specific_system_prompt(self, mode: str, conversation_context: Dict = {}) -> str:
         """Generate mode-specific system prompts with conversation context."""
-        base_prompts = {
-            "image_analysis": """You are an expert plant identification specialist with deep knowledge of horticulture, plant health, and gardening practices. You can identify plants from images and provide detailed care information.
-
-Your expertise includes:
-- Plant identification from photos
-- Health assessment and disease diagnosis
-- Care recommendations for Houston, TX climate
-- Soil, water, light, and temperature requirements
-- Pruning, fertilizing, and maintenance advice
-
-Previous conversation context: {context}
-
-Always provide accurate, helpful information and ask for clarification if needed.""",
-            
-            "database": """You are a knowledgeable gardening assistant with access to the user's garden database. You can help with plant care, garden management, and provide personalized advice based on their specific plants and garden setup.
-
-Your capabilities include:
-- Accessing and querying the user's garden database
-- Providing care information for specific plants
-- Garden planning and plant recommendations
-- Seasonal care advice for Houston, TX climate
-- Troubleshooting plant issues
-
-Previous conversation context: {context}
-
-Always reference the user's actual garden data when possible and provide practical, actionable advice.""",
-            
-            "general": """You are a helpful gardening assistant that can work in multiple modes. You can help with plant identification, garden database queries, and general gardening advice.
-
-Previous conversation context: {context}
-
-Please provide helpful, accurate information and ask for clarification if needed."""
-        }
-        
-        # Get the appropriate base prompt for the mode
-        base_prompt = base_prompts.get(mode, base_prompts["general"])
-        
         # Extract context information if provided
         context_info = ""
         if conversation_context and conversation_context.get('exists'):
@@ -330,15 +602,15 @@ Please provide helpful, accurate information and ask for clarification if needed
                     context_info = " ".join(context_parts)
         
         # Format the prompt with context
-        return base_prompt.format(context=context_info if context_info else "No previous context")
+        return _format_system_prompt(mode, context_info if context_info else "No previous context")
 
     def get_conversation_context_summary(self, conversation_id: str, max_length: int = 200) -> str:
         """Generate a concise summary of conversation context for cross-mode transitions."""
-        context = self.get_conversation_context(conversation_id)
-        if not context['exists']:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
             return "No conversation context available"
         
-        messages = context['messages']
+        messages = conversation['messages']
         if not messages:
             return "No messages in conversation"
         
@@ -346,20 +618,22 @@ Please provide helpful, accurate information and ask for clarification if needed
         summary_parts = []
         
         # Get the current mode
-        mode = context['metadata'].get('mode', 'unknown')
+        mode = conversation.get('metadata', {}).get('mode', 'unknown')
         summary_parts.append(f"Mode: {mode}")
         
-        # Get recent user messages for context
-        user_messages = [msg for msg in messages[-5:] if msg.get('role') == 'user']
+        # Get recent user messages (with their stored lowercased text) for context,
+        # reading only the tail of the history rather than copying all of it
+        user_messages = [
+            content_lower
+            for msg, content_lower in zip(_tail(messages, 5), _tail(conversation['content_lower'], 5))
+            if msg.get('role') == 'user'
+        ]
         if user_messages:
             recent_topics = []
-            for msg in user_messages:
-                content = msg.get('content', '')
-                if content:
+            for content_lower in user_messages:
+                if content_lower:
                     # Extract key topics (improved approach)
-                    content_lower = content.lower()
-                    plant_keywords = ['tomato', 'pepper', 'herb', 'flower', 'tree', 'shrub', 'plant', 'garden', 'care', 'water', 'sun', 'soil', 'prune', 'fertilize']
-                    found_keywords = [word for word in plant_keywords if word in content_lower]
+                    found_keywords = [word for word in _SUMMARY_TOPIC_KEYWORDS if word in content_lower]
                     if found_keywords:
                         recent_topics.extend(found_keywords[:2])  # Limit to 2 keywords per message
             
@@ -380,8 +654,8 @@ Please provide helpful, accurate information and ask for clarification if needed
 
     def get_conversation_preview(self, conversation_id: str) -> Dict:
         """Generate a detailed preview of conversation content for history display."""
-        context = self.get_conversation_context(conversation_id)
-        if not context['exists']:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
             return {
                 'title': 'No conversation',
                 'summary': 'Conversation not found',
@@ -392,75 +666,35 @@ Please provide helpful, accurate information and ask for clarification if needed
                 'message_count': 0
             }
         
-        messages = context['messages']
-        if not messages:
+        # Reuse the cached preview while the conversation is unchanged
+        cache_key = (len(conversation['messages']), conversation.get('last_activity'))
+        cached = self._preview_cache.get(conversation_id)
+        if cached is not None and cached[0] == cache_key:
+            return dict(cached[1])  # Shallow copy so callers can't rewrite the cached entry
+        
+        metadata = conversation.get('metadata', {})
+        message_count = len(conversation['messages'])
+        if not message_count:
             return {
                 'title': 'Empty conversation',
                 'summary': 'No messages in conversation',
                 'plants_mentioned': [],
                 'key_topics': [],
                 'actions': [],
-                'last_activity': context.get('last_activity'),
+                'last_activity': conversation.get('last_activity'),
                 'message_count': 0,
-                'mode': context['metadata'].get('mode', 'unknown')
+                'mode': metadata.get('mode', 'unknown')
             }
         
-        # Extract plants mentioned
-        plants_mentioned = []
-        plant_keywords = ['tomato', 'pepper', 'herb', 'flower', 'tree', 'shrub', 'rose', 'lily', 'daisy', 'mint', 'basil', 'oregano', 'sage', 'thyme', 'rosemary', 'lavender', 'succulent', 'cactus', 'fern', 'palm', 'oak', 'maple', 'birch', 'willow', 'cherry', 'apple', 'peach', 'plum', 'lemon', 'lime', 'orange', 'grape', 'strawberry', 'blueberry', 'raspberry', 'blackberry', 'cucumber', 'carrot', 'lettuce', 'spinach', 'kale', 'broccoli', 'cauliflower', 'onion', 'garlic', 'potato', 'sweet potato', 'corn', 'bean', 'pea', 'zucchini', 'squash', 'pumpkin', 'melon', 'watermelon']
-        
-        # Extract key topics and actions
-        key_topics = []
-        actions = []
-        last_user_message = ""
-        last_ai_response = ""
-        
-        for msg in messages:
-            content = msg.get('content', '')
-            role = msg.get('role', '')
-            
-            if content:
-                content_lower = content.lower()
-                
-                # Extract plants mentioned
-                for plant in plant_keywords:
-                    if plant in content_lower and plant not in plants_mentioned:
-                        plants_mentioned.append(plant)
-                
-                # Extract key topics (improved detection)
-                topic_keywords = ['care', 'water', 'sun', 'soil', 'prune', 'fertilize', 'fertilizing', 'plant', 'grow', 'harvest', 'disease', 'pest', 'location', 'photo', 'picture', 'identify', 'diagnose', 'advice', 'tip', 'season', 'weather', 'climate', 'temperature', 'humidity', 'light', 'shade', 'full sun', 'partial shade', 'drought', 'flood', 'maintenance', 'repot', 'transplant', 'seed', 'seedling', 'mature', 'bloom', 'flower', 'fruit', 'vegetable', 'herb', 'annual', 'perennial']
-                
-                for topic in topic_keywords:
-                    if topic in content_lower and topic not in key_topics:
-                        key_topics.append(topic)
-                
-                # Extract actions
-                if 'add plant' in content_lower:
-                    actions.append('Plant added')
-                elif 'update' in content_lower:
-                    actions.append('Plant updated')
-                elif 'identify' in content_lower or 'what is this' in content_lower:
-                    actions.append('Plant identification')
-                elif 'care' in content_lower or 'how to' in content_lower:
-                    actions.append('Care advice')
-                elif 'location' in content_lower or 'where' in content_lower:
-                    actions.append('Location query')
-                elif 'photo' in content_lower or 'picture' in content_lower:
-                    actions.append('Photo request')
-                
-                # Store last messages for summary
-                if role == 'user':
-                    last_user_message = content[:100] + "..." if len(content) > 100 else content
-                elif role == 'assistant':
-                    last_ai_response = content[:100] + "..." if len(content) > 100 else content
-        
-        # Generate title and summary
-        title = "Garden conversation"
-        if plants_mentioned:
-            title = f"About {', '.join(plants_mentioned[:2])}"
-            if len(plants_mentioned) > 2:
-                title += f" and {len(plants_mentioned) - 2} more"
+        # Plants, topics, actions and last messages are kept up to date by add_message
+        state = conversation['preview_state']
+        plants_mentioned = state['plants_mentioned']
+        key_topics = state['key_topics']
+        last_user_message = state['last_user_message']
+        last_ai_response = state['last_ai_response']
         
+        # Title is maintained with the plant list; build the summary
+        title = state['title']
         summary = ""
         if last_user_message:
             summary = f"Q: {last_user_message}"
@@ -470,16 +704,18 @@ Please provide helpful, accurate information and ask for clarification if needed
         if not summary:
             summary = f"Conversation about {', '.join(key_topics[:3]) if key_topics else 'gardening'}"
         
-        return {
+        preview = {
             'title': title,
             'summary': summary,
             'plants_mentioned': plants_mentioned[:5],  # Limit to 5 plants
             'key_topics': key_topics[:5],  # Limit to 5 topics
-            'actions': list(set(actions))[:3],  # Limit to 3 unique actions
-            'last_activity': context.get('last_activity'),
-            'message_count': len(messages),
-            'mode': context['metadata'].get('mode', 'unknown')
+            'actions': list(state['actions'])[:3],  # Limit to 3 unique actions
+            'last_activity': conversation.get('last_activity'),
+            'message_count': message_count,
+            'mode': metadata.get('mode', 'unknown')
         }
+        self._preview_cache[conversation_id] = (cache_key, preview)
+        return dict(preview)
 
     def get_conversation_history_summary(self, conversation_id: str) -> Dict:
         """Generate a user-friendly summary for conversation history display."""
@@ -511,6 +747,12 @@ Please provide helpful, accurate information and ask for clarification if needed
             'conversation_id': conversation_id
         }
 
+    def bulk_get_summaries(self, conversation_ids: List[str]) -> List[Dict]:
+        """Generate history summaries for several conversations, in the order given."""
+        # Summaries read incrementally maintained preview state, so a plain loop is cheaper
+        # than handing each one to a worker pool
+        return [self.get_conversation_history_summary(conversation_id) for conversation_id in conversation_ids]
+
     def add_conversation_metadata(self, conversation_id: str, metadata: Dict) -> bool:
         """Add or update conversation metadata."""
         if conversation_id not in self.conversations:
@@ -522,7 +764,7 @@ Please provide helpful, accurate information and ask for clarification if needed
         
         # Update metadata
         self.conversations[conversation_id]['metadata'].update(metadata)
-        self.conversations[conversation_id]['last_activity'] = datetime.now()
+        self._touch(conversation_id)
         
         logger.info(f"Updated metadata for conversation {conversation_id}")
         return True
@@ -534,22 +776,27 @@ Please provide helpful, accurate information and ask for clarification if needed
             return False
         
         self.conversations[conversation_id] = {
-            'messages': [],
-            'last_activity': datetime.now(),
+            'messages': deque(),
+            'token_counts': deque(),
+            'total_tokens': 0,
+            'content_lower': deque(),
+            'preview_state': _new_preview_state(),
+            'last_activity': self._now(),
             'metadata': initial_metadata or {
-                'created_at': datetime.now(),
+                'created_at': self._now(),
                 'mode': 'general',
                 'total_messages': 0
             }
         }
+        self._touch(conversation_id)
         
         logger.info(f"Created conversation {conversation_id} with metadata")
         return True
 
     def get_cross_mode_context(self, conversation_id: str) -> Dict:
         """Get context information suitable for cross-mode transitions."""
-        context = self.get_conversation_context(conversation_id)
-        if not context['exists']:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
             return {
                 'available': False,
                 'mode': 'unknown',
@@ -559,18 +806,15 @@ Please provide helpful, accurate information and ask for clarification if needed
             }
         
         # Extract recent topics and user preferences
-        messages = context['messages']
+        messages = conversation['messages']
         recent_topics = []
         user_preferences = {}
         
-        # Analyze recent messages for topics and preferences
-        for msg in messages[-10:]:  # Last 10 messages
+        # Analyze recent messages for topics and preferences, using the text lowercased at ingestion
+        for msg, content in zip(_tail(messages, 10), _tail(conversation['content_lower'], 10)):  # Last 10 messages
             if msg.get('role') == 'user':
-                content = msg.get('content', '').lower()
-                
                 # Extract plant-related topics
-                plant_keywords = ['tomato', 'pepper', 'herb', 'flower', 'tree', 'shrub', 'vegetable']
-                for keyword in plant_keywords:
+                for keyword in _CROSS_MODE_TOPIC_KEYWORDS:
                     if keyword in content:
                         recent_topics.append(keyword)
                 
@@ -584,12 +828,12 @@ Please provide helpful, accurate information and ask for clarification if needed
         
         return {
             'available': True,
-            'mode': context['metadata'].get('mode', 'unknown'),
+            'mode': conversation.get('metadata', {}).get('mode', 'unknown'),
             'summary': self.get_conversation_context_summary(conversation_id),
             'recent_topics': list(set(recent_topics))[:5],  # Unique topics, limit to 5
             'user_preferences': user_preferences,
             'message_count': len(messages),
-            'total_tokens': context['total_tokens']
+            'total_tokens': conversation['total_tokens']
         }
 
     def create_mode_transition_context(self, conversation_id: str, new_mode: str) -> Dict:
@@ -608,13 +852,13 @@ Please provide helpful, accurate information and ask for clarification if needed
             'context_summary': cross_context.get('summary', ''),
             'recent_topics': cross_context.get('recent_topics', []),
             'user_preferences': cross_context.get('user_preferences', {}),
-            'transition_timestamp': datetime.now().isoformat()
+            'transition_timestamp': self._now().isoformat()
         }
         
         # Update conversation metadata with mode transition
         self.add_conversation_metadata(conversation_id, {
             'mode': new_mode,
-            'last_mode_transition': datetime.now(),
+            'last_mode_transition': self._now(),
             'mode_transition_count': cross_context.get('mode_transition_count', 0) + 1
         })
         
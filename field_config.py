@@ -4,7 +4,9 @@ Defines all database field names, user-friendly aliases, field categories, and p
 Every line is documented inline.
 """
 
-from typing import Optional
+from collections import defaultdict
+from functools import lru_cache
+from typing import Optional, Tuple
 
 # List of all database field names as they appear in the Google Sheet
 FIELD_NAMES = [
@@ -148,31 +150,46 @@ FIELD_CATEGORIES = {
     ],
 }
 
+# Single case-insensitive lookup: lowercased alias or field name -> canonical field name.
+# Field names are applied last so they take precedence over any alias with the same spelling.
+_CANONICAL_LOOKUP = dict(FIELD_ALIASES)
+_CANONICAL_LOOKUP.update({name.lower(): name for name in FIELD_NAMES})
+
+# Reverse index of FIELD_ALIASES: canonical field name -> aliases in declaration order
+_aliases_by_canonical = defaultdict(list)
+for _alias, _canonical in FIELD_ALIASES.items():
+    _aliases_by_canonical[_canonical].append(_alias)
+_ALIASES_BY_CANONICAL = {canonical: tuple(aliases) for canonical, aliases in _aliases_by_canonical.items()}
+del _aliases_by_canonical, _alias, _canonical
+
+# Reverse index of FIELD_CATEGORIES: canonical field name -> category
+_FIELD_CATEGORY_OF = {field: category for category, fields in FIELD_CATEGORIES.items() for field in fields}
+
 # Function to get the canonical field name from an alias
-# Returns the canonical field name if found, else None
+# Returns the canonical field name if found, else None (memoized: callers resolve the same few names repeatedly)
+@lru_cache(maxsize=512)
 def get_canonical_field_name(alias: str) -> Optional[str]:
     """Return the canonical field name for a given alias (case-insensitive), or None if not found."""
-    # Lowercase the alias for matching
-    alias_lc = alias.strip().lower()
-    # Check if alias is a direct field name
-    if alias_lc in (name.lower() for name in FIELD_NAMES):
-        # Return the properly cased field name
-        for name in FIELD_NAMES:
-            if name.lower() == alias_lc:
-                return name
-    # Check if alias is in the alias mapping
-    return FIELD_ALIASES.get(alias_lc)
+    return _CANONICAL_LOOKUP.get(alias.strip().lower())
 
 # Function to validate if a field name or alias is valid
+@lru_cache(maxsize=512)
 def is_valid_field(field: str) -> bool:
     """Return True if the field or alias is valid, False otherwise."""
     # Try to get the canonical field name
     return get_canonical_field_name(field) is not None
 
+# Immutable snapshot of the canonical field names, built once
+@lru_cache(maxsize=1)
+def _field_names_tuple() -> Tuple[str, ...]:
+    """Return all canonical field names as a cached tuple."""
+    return tuple(FIELD_NAMES)
+
 # Function to get all canonical field names
 def get_all_field_names() -> list:
     """Return a list of all canonical field names."""
-    return FIELD_NAMES.copy()
+    # Callers may mutate the result, so hand out a fresh list built from the cached tuple
+    return list(_field_names_tuple())
 
 # Function to get all aliases for a canonical field name
 def get_aliases_for_field(field_name: str) -> list:
@@ -185,11 +202,7 @@ def get_aliases_for_field(field_name: str) -> list:
     Returns:
         list: List of aliases for the field
     """
-    aliases = []
-    for alias, canonical in FIELD_ALIASES.items():
-        if canonical == field_name:
-            aliases.append(alias)
-    return aliases
+    return list(_ALIASES_BY_CANONICAL.get(field_name, ()))
 
 def get_field_alias(field_name: str) -> str:
     """
@@ -205,18 +218,12 @@ def get_field_alias(field_name: str) -> str:
     if field_name in FIELD_ALIASES:
         return field_name
     
-    # Look for aliases that map to this field name
-    for alias, canonical in FIELD_ALIASES.items():
-        if canonical == field_name:
-            return alias
-    
-    # If no alias found, return the field name itself
-    return field_name
+    # Use the first alias that maps to this field name, or the field name itself if none exists
+    aliases = _ALIASES_BY_CANONICAL.get(field_name)
+    return aliases[0] if aliases else field_name
 
 # Function to get the category for a field name
+@lru_cache(maxsize=512)
 def get_field_category(field_name: str) -> Optional[str]:
     """Return the category for a given canonical field name, or None if not found."""
-    for category, fields in FIELD_CATEGORIES.items():
-        if field_name in fields:
-            return category
-    return None 
\ No newline at end of file
+    return _FIELD_CATEGORY_OF.get(field_name) 
\ No newline at end of file
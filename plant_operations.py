@@ -1,12 +1,14 @@
 import logging
 from datetime import datetime
 import pytz
-from typing import List, Dict, Optional, Tuple, Union
+from typing import List, Dict, Optional, Sequence, Tuple, Union
 from config import sheets_client, SPREADSHEET_ID, RANGE_NAME
 from sheets_client import check_rate_limit, get_next_id
 from field_config import get_canonical_field_name, get_all_field_names, is_valid_field
 import re
+import threading
 import time
+from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
@@ -689,78 +691,157 @@ def search_plants(query: str) -> List[Dict]:
         return []
 
 # Phase 2: Plant List Caching System
-_plant_list_cache = {
-    'names': [],
-    'last_updated': 0,
-    'cache_duration': 300  # 5 minutes cache duration
-}
+# Header row and data rows of RANGE_NAME, fetched together in one batchGet round-trip
+_SHEET_NAME, _SHEET_COLUMNS = RANGE_NAME.split('!')
+_FIRST_COLUMN, _LAST_COLUMN = (re.sub(r'\d', '', column) for column in _SHEET_COLUMNS.split(':'))
+HEADER_RANGE = f"{_SHEET_NAME}!{_FIRST_COLUMN}1:{_LAST_COLUMN}1"
+DATA_RANGE = f"{_SHEET_NAME}!{_FIRST_COLUMN}2:{_LAST_COLUMN}"
 
-def get_plant_names_from_database() -> List[str]:
+CACHE_TTL = 300  # Seconds a fetched plant list stays fresh (5 minutes)
+_plant_list_lock = threading.Lock()  # Serializes cache refills so concurrent misses make one Sheets call
+
+@dataclass(slots=True)
+class PlantListCache:
+    """Cached plant list and the indexes derived from it, read as attributes on every lookup."""
+    names: Tuple[str, ...] = ()  # Immutable snapshot, handed to callers without copying
+    names_lower: Tuple[str, ...] = ()  # Lowercased names, aligned with names, built once per fetch
+    names_lower_sorted: Tuple[Tuple[str, str], ...] = ()  # Sorted (word-start suffix, lowercased name) pairs for bisect lookups
+    last_updated: float = 0.0  # time.monotonic() of the last fetch; 0 means never fetched or invalidated
+    cache_duration: int = CACHE_TTL
+    version: int = 0  # Bumped whenever the names are replaced or invalidated, for caches derived from them
+
+_plant_list_cache = PlantListCache()
+
+def _store_plant_names(plant_names, current_time: float) -> None:
+    """Replace the cached plant names and their lowercased index together."""
+    _plant_list_cache.names = tuple(plant_names)
+    _plant_list_cache.names_lower = tuple(map(str.lower, _plant_list_cache.names))
+    _plant_list_cache.names_lower_sorted = _build_name_index(_plant_list_cache.names_lower)
+    _plant_list_cache.last_updated = current_time
+    _plant_list_cache.version += 1
+
+_WORD_START_RE = re.compile(r'\b\w')
+
+def _build_name_index(names_lower: Sequence[str]) -> Tuple[Tuple[str, str], ...]:
+    """Sort every word-start suffix of each name ('cherry tomato', 'tomato') with the name it belongs to."""
+    return tuple(sorted({(name[match.start():], name)
+                         for name in names_lower
+                         for match in _WORD_START_RE.finditer(name)}))
+
+def get_plant_names_lower(plant_names: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Get plant_names lowercased, aligned by index.
+    
+    When plant_names is the snapshot returned by get_plant_names_from_database,
+    the copy precomputed at fetch time is returned instead of lowering every name again.
+    
+    Args:
+        plant_names (Sequence[str]): Plant names to lowercase
+        
+    Returns:
+        Tuple[str, ...]: The lowercased names
+    """
+    if plant_names is _plant_list_cache.names:
+        return _plant_list_cache.names_lower
+    return tuple(map(str.lower, plant_names))
+
+def get_plant_name_index(plant_names: Sequence[str]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Get the sorted name index used for bisect lookups of plant_names.
+    
+    Each entry is a (suffix, lowercased name) pair, one for every suffix of a name that
+    starts a word, so a plant can be found by its full name or by any of its trailing words.
+    Like get_plant_names_lower, the cached snapshot's index is reused rather than rebuilt.
+    
+    Args:
+        plant_names (Sequence[str]): Plant names to index
+        
+    Returns:
+        Tuple[Tuple[str, str], ...]: The index, sorted by suffix
     """
-    Get a list of all plant names from the database.
+    if plant_names is _plant_list_cache.names:
+        return _plant_list_cache.names_lower_sorted
+    return _build_name_index(get_plant_names_lower(plant_names))
+
+def get_plant_names_from_database() -> Tuple[str, ...]:
+    """
+    Get all plant names from the database.
     
     This function uses caching to improve performance and reduce API calls.
     The cache is invalidated when plants are added or updated.
     
     Returns:
-        List[str]: List of plant names currently in the database
+        Tuple[str, ...]: Plant names currently in the database. The tuple is the
+        cached snapshot itself, so callers that need to modify it should copy it
+        with list(...)
     """
     # Import here to avoid circular imports
     from plant_operations import _plant_list_cache
     
-    current_time = time.time()
-    cache_duration = 300  # 5 minutes
-    
     # Check if cache is still valid
-    if (_plant_list_cache['names'] and 
-        _plant_list_cache['last_updated'] and 
-        current_time - _plant_list_cache['last_updated'] < cache_duration):
-        logger.info(f"Returning cached plant list with {len(_plant_list_cache['names'])} plants")
-        return _plant_list_cache['names'].copy()
+    if _plant_list_cache_is_fresh():
+        logger.info(f"Returning cached plant list with {len(_plant_list_cache.names)} plants")
+        return _plant_list_cache.names
     
+    # Single flight: one caller refills the cache while concurrent misses wait and reuse its result
+    with _plant_list_lock:
+        if _plant_list_cache_is_fresh():
+            logger.info(f"Returning plant list refreshed by a concurrent request ({len(_plant_list_cache.names)} plants)")
+            return _plant_list_cache.names
+        return _fetch_plant_names()
+
+def _plant_list_cache_is_fresh() -> bool:
+    """Whether the cached plant list is non-empty and younger than CACHE_TTL."""
+    last_updated = _plant_list_cache.last_updated
+    # Monotonic clock: expiry is unaffected by wall-clock (NTP) adjustments
+    return bool(_plant_list_cache.names and last_updated and
+                time.monotonic() - last_updated < CACHE_TTL)
+
+def _fetch_plant_names() -> Tuple[str, ...]:
+    """Fetch plant names from the sheet into the cache; callers hold _plant_list_lock."""
+    current_time = time.monotonic()
     try:
         logger.info("Cache expired, fetching fresh plant list from database")
         check_rate_limit()
         
-        result = sheets_client.values().get(
+        # Header and data rows come back in one call, one valueRange per requested range
+        result = sheets_client.values().batchGet(
             spreadsheetId=SPREADSHEET_ID,
-            range=RANGE_NAME
+            ranges=[HEADER_RANGE, DATA_RANGE],
+            majorDimension='ROWS'
         ).execute()
         
-        values = result.get('values', [])
-        if not values or len(values) <= 1:
+        header_range, data_range = result.get('valueRanges', [{}, {}])
+        rows = data_range.get('values', [])
+        if not rows:
             logger.warning("No plants found in database or only header row present")
-            _plant_list_cache['names'] = []
-            _plant_list_cache['last_updated'] = current_time
-            return []
+            _store_plant_names((), current_time)
+            return ()
         
-        headers = values[0]
+        headers = (header_range.get('values') or [[]])[0]
         # Use field_config to get canonical field name
         plant_name_field = get_canonical_field_name('Plant Name')
-        name_idx = headers.index(plant_name_field) if plant_name_field in headers else 1
+        try:
+            name_idx = headers.index(plant_name_field)
+        except ValueError:
+            name_idx = 1  # No Plant Name header; fall back to the usual column
         
-        # Extract plant names from all rows except header
-        plant_names = []
-        for row in values[1:]:
-            if len(row) > name_idx and row[name_idx]:
-                plant_name = row[name_idx].strip()
-                if plant_name:  # Only add non-empty names
-                    plant_names.append(plant_name)
+        # Extract the non-empty, stripped plant names from all data rows in one pass
+        plant_names = tuple(filter(None, (row[name_idx].strip() for row in rows if len(row) > name_idx)))
         
         # Update cache
-        _plant_list_cache['names'] = plant_names
-        _plant_list_cache['last_updated'] = current_time
+        _store_plant_names(plant_names, current_time)
         
         logger.info(f"Updated plant list cache with {len(plant_names)} plants")
-        return plant_names.copy()
+        return _plant_list_cache.names
         
     except Exception as e:
         logger.error(f"Error fetching plant names from database: {e}")
         # Return cached data if available, otherwise empty list
-        if _plant_list_cache['names']:
+        if _plant_list_cache.names:
             logger.info("Returning cached plant list due to database error")
-            return _plant_list_cache['names'].copy()
-        return []
+            return _plant_list_cache.names
+        return ()
 
 def invalidate_plant_list_cache():
     """
@@ -768,28 +849,39 @@ def invalidate_plant_list_cache():
     
     This should be called when plants are added, updated, or removed from the database.
     """
-    global _plant_list_cache
-    _plant_list_cache['last_updated'] = 0
+    _plant_list_cache.last_updated = 0
+    _plant_list_cache.version += 1
     logger.info("Plant list cache invalidated")
 
+def get_plant_list_version() -> int:
+    """
+    Get the plant list cache version, which changes whenever the cached names may have changed.
+    
+    Callers that cache results computed from the plant list can key them by this version.
+    
+    Returns:
+        int: The current version
+    """
+    return _plant_list_cache.version
+
 def get_plant_list_cache_info() -> Dict:
     """
     Get information about the current plant list cache status.
     
     Returns:
-        Dict: Cache information including count, last updated, and cache duration
+        Dict: Cache information including count, last updated (a time.monotonic()
+        reading, 0 if never fetched), and cache duration
     """
-    global _plant_list_cache
-    current_time = time.time()
-    age = current_time - _plant_list_cache['last_updated']
-    is_valid = age < _plant_list_cache['cache_duration']
+    last_updated = _plant_list_cache.last_updated
+    age = time.monotonic() - last_updated
+    is_valid = bool(last_updated) and age < CACHE_TTL
     
     return {
-        'plant_count': len(_plant_list_cache['names']),
-        'last_updated': _plant_list_cache['last_updated'],
+        'plant_count': len(_plant_list_cache.names),
+        'last_updated': _plant_list_cache.last_updated,
         'cache_age_seconds': age,
         'is_valid': is_valid,
-        'cache_duration_seconds': _plant_list_cache['cache_duration']
+        'cache_duration_seconds': _plant_list_cache.cache_duration
     } 
 
 def get_location_names_from_database() -> List[str]:
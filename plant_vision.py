@@ -6,6 +6,8 @@ from typing import Optional, Tuple, List, Dict, Any  # Import typing for type an
 from datetime import datetime, timedelta  # Import datetime for date and time operations
 import imghdr  # Import imghdr for image type checking
 import traceback  # Import traceback for error tracing
+import re  # Import regex for pattern matching
+from functools import lru_cache  # Import lru_cache for memoizing plant name extraction
 try:
     from PIL import Image  # Import Image from PIL for image processing
 except ImportError:
@@ -392,6 +394,22 @@ def check_plant_in_database(plant_name: str) -> Dict[str, Any]:
             "error": str(e)
         }
 
+# Very restrictive patterns - only look for clear plant identification
+_PLANT_NAME_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Look for "Common name:" specifically
+    r'common name[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+    # Look for "Scientific name:" specifically
+    r'scientific name[:\s]+([A-Z][a-z]+\s+[a-z]+)',
+    # Look for "This is a [Plant Name]" pattern
+    r'this is a\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+    # Look for "Identified as [Plant Name]" pattern
+    r'identified as\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+))
+_IDENTIFICATION_SECTION_RE = re.compile(r'##\s*Plant\s*Identification.*?(?=##|$)', re.IGNORECASE | re.DOTALL)
+# Common non-plant words and phrases that the patterns above can capture
+_NON_PLANT_WORDS = frozenset(['the', 'this', 'that', 'these', 'those', 'plant', 'specimen', 'variety', 'species', 'genus', 'family', 'one', 'large', 'flower', 'is', 'actually'])
+_NON_PLANT_FRAGMENTS = ('one large', 'flower is', 'is actually', 'this specific', 'best practices')
+
 def extract_plant_names_from_analysis(analysis_text: str) -> List[str]:
     """
     Extract plant names from AI analysis text for database checking
@@ -405,50 +423,38 @@ def extract_plant_names_from_analysis(analysis_text: str) -> List[str]:
     Returns:
         List[str]: List of extracted plant names
     """
+    # Results are memoized per analysis text; hand each caller its own list
+    return list(_extract_plant_names(analysis_text))
+
+@lru_cache(maxsize=256)
+def _extract_plant_names(analysis_text: str) -> Tuple[str, ...]:
+    """Cached worker for extract_plant_names_from_analysis; returns an immutable tuple."""
     try:
-        import re  # Import regex for pattern matching
-        
         plant_names = []  # Initialize list to store plant names
         
-        # Very restrictive patterns - only look for clear plant identification
-        patterns = [
-            # Look for "Common name:" specifically
-            r'common name[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            # Look for "Scientific name:" specifically  
-            r'scientific name[:\s]+([A-Z][a-z]+\s+[a-z]+)',
-            # Look for "This is a [Plant Name]" pattern
-            r'this is a\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            # Look for "Identified as [Plant Name]" pattern
-            r'identified as\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-        ]
-        
         # First, try to find the Plant Identification section
-        identification_section = re.search(r'##\s*Plant\s*Identification.*?(?=##|$)', analysis_text, re.IGNORECASE | re.DOTALL)
+        identification_section = _IDENTIFICATION_SECTION_RE.search(analysis_text)
         
         if identification_section:
             # Extract from the identification section only
             section_text = identification_section.group(0)
             logger.info(f"Found Plant Identification section: {section_text[:200]}...")
             
-            for pattern in patterns:
-                matches = re.findall(pattern, section_text, re.IGNORECASE)
+            for pattern in _PLANT_NAME_PATTERNS:
+                matches = pattern.findall(section_text)
                 for match in matches:
                     if match and len(match.strip()) > 2 and len(match.strip()) < 30:  # Shorter max length
                         # Filter out common non-plant words and phrases
-                        non_plant_words = ['the', 'this', 'that', 'these', 'those', 'plant', 'specimen', 'variety', 'species', 'genus', 'family', 'one', 'large', 'flower', 'is', 'actually']
-                        if match.strip().lower() not in non_plant_words:
+                        if match.strip().lower() not in _NON_PLANT_WORDS:
                             # Additional check: make sure it doesn't contain common sentence fragments
-                            if not any(fragment in match.lower() for fragment in ['one large', 'flower is', 'is actually', 'this specific', 'best practices']):
+                            if not any(fragment in match.lower() for fragment in _NON_PLANT_FRAGMENTS):
                                 plant_names.append(match.strip())
         else:
             logger.info("No Plant Identification section found, skipping database integration")
-            return []
+            return ()
         
         # Remove duplicates while preserving order
-        unique_names = []
-        for name in plant_names:
-            if name not in unique_names:
-                unique_names.append(name)
+        unique_names = list(dict.fromkeys(plant_names))
         
         # Additional filtering: only keep names that look like actual plant names
         filtered_names = []
@@ -461,11 +467,11 @@ def extract_plant_names_from_analysis(analysis_text: str) -> List[str]:
                     filtered_names.append(name)
         
         logger.info(f"Extracted plant names from analysis: {filtered_names}")
-        return filtered_names
+        return tuple(filtered_names)
         
     except Exception as e:
         logger.error(f"Error extracting plant names from analysis: {e}")
-        return []
+        return ()
 
 def enhance_analysis_with_database_check(analysis_text: str) -> str:
     """
@@ -11,7 +11,11 @@ Date: December 2024
 
 import logging
 import json
-from typing import Dict, List, Optional, Tuple
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, Tuple
 from config import openai_client
 
 logger = logging.getLogger(__name__)
@@ -27,15 +31,15 @@ class QueryType:
     ADVICE = "ADVICE"         # How do I [action] my [plants]?
     GENERAL = "GENERAL"       # General gardening questions
 
-def get_plant_list_from_database() -> List[str]:
+def get_plant_list_from_database() -> Tuple[str, ...]:
     """
-    Get the current list of plant names from the database.
+    Get the current plant names from the database.
     
     This function uses the cached plant list from plant_operations
     to provide efficient access to plant names for query analysis.
     
     Returns:
-        List[str]: List of plant names currently in the database
+        Tuple[str, ...]: Plant names currently in the database (the cached snapshot)
     """
     try:
         # Phase 2: Use the new cached plant list function
@@ -50,6 +54,25 @@ def get_plant_list_from_database() -> List[str]:
         logger.error(f"Error getting plant list from database: {e}")
         return []
 
+# Words that can steer a query away from GENERAL (list, location, photo, care, diagnosis and
+# advice cues). Queries with none of these and no plant name skip the classification call.
+_INTENT_KEYWORDS = frozenset({
+    'plant', 'plants', 'garden', 'list', 'all', 'which', 'have',
+    'where', 'location', 'located',
+    'show', 'picture', 'pictures', 'photo', 'photos', 'image', 'see', 'look', 'looks',
+    'care', 'water', 'watering', 'fertilize', 'fertilizer', 'feed', 'sun', 'light', 'soil', 'mulch', 'repot',
+    'why', 'yellow', 'brown', 'wilt', 'wilting', 'dying', 'dead', 'spots', 'pest', 'pests', 'disease', 'sick', 'problem', 'wrong',
+    'how', 'prune', 'pruning', 'grow', 'growing', 'propagate', 'harvest', 'tips', 'should', 'when'
+})
+_WORD_RE = re.compile(r'[a-z]+')
+
+def _needs_classification(query_lower: str, plant_list: Sequence[str]) -> bool:
+    """Whether a query mentions a plant or a query-type keyword, so only the AI can classify it."""
+    if not _INTENT_KEYWORDS.isdisjoint(_WORD_RE.findall(query_lower)):
+        return True
+    from plant_operations import get_plant_name_index
+    return bool(_find_plant_matches(query_lower, get_plant_name_index(plant_list)))
+
 # Remove location_references and LOCATION_PLANTS from prompt and fallback
 # Only support plant_references and the original query types
 # The AI will be used for location matching in a separate call, not as part of the main query analyzer
@@ -60,6 +83,8 @@ def analyze_query(user_query: str, plant_list: Optional[List[str]] = None) -> Di
     This function makes a single AI call to:
     1. Extract plant names referenced in the query
     2. Classify the query type (LOCATION, PHOTO, LIST, CARE, DIAGNOSIS, ADVICE, GENERAL)
+    When the plant list comes from the database, results are cached per query until
+    that list changes, so repeated queries don't call the AI again.
     Args:
         user_query (str): The user's question or request
         plant_list (Optional[List[str]]): List of plant names from database. 
@@ -74,32 +99,60 @@ def analyze_query(user_query: str, plant_list: Optional[List[str]] = None) -> Di
     logger.info(f"Analyzing query: {user_query}")
     try:
         if plant_list is None:
-            plant_list = get_plant_list_from_database()
-        prompt = _build_analysis_prompt(user_query, plant_list)
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a gardening assistant that analyzes user queries to extract plant references and classify query types."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            max_tokens=500
-        )
-        ai_response_content = response.choices[0].message.content
-        if ai_response_content is None:
-            raise ValueError("AI response content is None")
-        analysis_result = _parse_analysis_response(ai_response_content)
-        analysis_result['original_query'] = user_query
-        analysis_result['plant_list_provided'] = len(plant_list) if plant_list else 0
-        analysis_result['requires_ai_response'] = analysis_result['query_type'] in [
-            QueryType.CARE, QueryType.DIAGNOSIS, QueryType.ADVICE, QueryType.GENERAL
-        ]
-        logger.info(f"Query analysis result: {analysis_result}")
-        return analysis_result
+            get_plant_list_from_database()  # Fetch once, refreshing the cached list so its version is current
+            from plant_operations import get_plant_list_version
+            analysis_result = _analyze_database_query(user_query, get_plant_list_version())
+        else:
+            analysis_result = _analyze(user_query, plant_list)
+        # Callers get their own copy; the cached result must stay unchanged
+        return {**analysis_result, 'plant_references': list(analysis_result['plant_references'])}
     except Exception as e:
         logger.error(f"Error analyzing query: {e}")
         return _get_fallback_analysis(user_query)
 
+@lru_cache(maxsize=512)
+def _analyze_database_query(user_query: str, plant_list_version: int) -> Dict:
+    """Analyze a query against the cached database plant list that analyze_query just refreshed;
+    cached by query and plant list version. Failures raise, so they are never cached."""
+    from plant_operations import _plant_list_cache
+    return _analyze(user_query, _plant_list_cache.names)
+
+def _analyze(user_query: str, plant_list: Sequence[str]) -> Dict:
+    """Classify a query and extract its plant references, calling the AI unless the prefilter settles it."""
+    # Nothing in the query could make it anything but GENERAL, so skip the classification call
+    if not _needs_classification(user_query.lower(), plant_list):
+        logger.info("No plant names or query-type keywords in query, classifying as GENERAL without AI")
+        return {
+            'plant_references': [],
+            'query_type': QueryType.GENERAL,
+            'confidence': 0.5,
+            'reasoning': 'Prefilter: no plant names or query-type keywords',
+            'requires_ai_response': True,
+            'original_query': user_query,
+            'plant_list_provided': len(plant_list) if plant_list else 0
+        }
+    prompt = _build_analysis_prompt(user_query, plant_list)
+    response = openai_client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": "You are a gardening assistant that analyzes user queries to extract plant references and classify query types."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.1,
+        max_tokens=500
+    )
+    ai_response_content = response.choices[0].message.content
+    if ai_response_content is None:
+        raise ValueError("AI response content is None")
+    analysis_result = _parse_analysis_response(ai_response_content)
+    analysis_result['original_query'] = user_query
+    analysis_result['plant_list_provided'] = len(plant_list) if plant_list else 0
+    analysis_result['requires_ai_response'] = analysis_result['query_type'] in [
+        QueryType.CARE, QueryType.DIAGNOSIS, QueryType.ADVICE, QueryType.GENERAL
+    ]
+    logger.info(f"Query analysis result: {analysis_result}")
+    return analysis_result
+
 def _build_analysis_prompt(user_query: str, plant_list: List[str]) -> str:
     plant_list_text = _get_smart_plant_list(user_query, plant_list)
     prompt = f"""
@@ -140,13 +193,64 @@ JSON only:
 """
     return prompt
 
-def _get_smart_plant_list(user_query: str, plant_list: List[str]) -> str:
+_WORD_START_RE = re.compile(r'\b\w')
+_index_key = itemgetter(0)
+
+def _find_plant_matches(query_lower: str, name_index: Sequence[Tuple[str, str]]) -> set:
+    """
+    Find the plants a query refers to using bisect lookups in the sorted name index.
+    
+    A plant matches when the query is the start of one of its words ("tomato" finds
+    "cherry tomato"), or when the plant name appears in the query starting at a word
+    ("where are my roses" finds "rose").
+    
+    Args:
+        query_lower (str): The lowercased user query
+        name_index (Sequence[Tuple[str, str]]): Sorted (suffix, name) pairs from get_plant_name_index
+    
+    Returns:
+        set: Lowercased names of the matching plants
+    """
+    matches = set()
+    if not query_lower or not name_index:
+        return matches
+    
+    # Query inside plant name: every suffix starting with the query sits in one sorted run
+    i = bisect_left(name_index, query_lower, key=_index_key)
+    while i < len(name_index) and name_index[i][0].startswith(query_lower):
+        matches.add(name_index[i][1])
+        i += 1
+    
+    # Plant name inside query: look for full names that are prefixes of each word-start suffix
+    for match in _WORD_START_RE.finditer(query_lower):
+        remaining = query_lower[match.start():]
+        while remaining:
+            j = bisect_right(name_index, remaining, key=_index_key)
+            if not j:
+                break
+            key = name_index[j - 1][0]
+            if remaining.startswith(key):
+                # Equal suffixes are adjacent; only those that are a whole name count here
+                while j and name_index[j - 1][0] == key:
+                    if name_index[j - 1][1] == key:
+                        matches.add(key)
+                    j -= 1
+                remaining = key[:-1]
+            else:
+                # Any shorter name that prefixes the query also prefixes key, so shrink to their common prefix
+                common = 0
+                while remaining[common] == key[common]:
+                    common += 1
+                remaining = remaining[:common]
+    return matches
+
+def _get_smart_plant_list(user_query: str, plant_list: Sequence[str]) -> str:
     """
     Get a smart selection of plants for the AI prompt, prioritizing potential matches.
     
     Args:
         user_query (str): The user's query
-        plant_list (List[str]): Full list of plant names from database
+        plant_list (Sequence[str]): Full list of plant names from database
     
     Returns:
         str: Formatted plant list for AI prompt
@@ -156,15 +260,13 @@ def _get_smart_plant_list(user_query: str, plant_list: List[str]) -> str:
     
     query_lower = user_query.lower().strip()
     
+    # Lowercased names and their sorted index come precomputed with the cached plant list
+    from plant_operations import get_plant_names_lower, get_plant_name_index
+    
     # First, try to find exact or partial matches in the full plant list
-    matching_plants = []
-    for plant in plant_list:
-        plant_lower = plant.lower()
-        # Check for exact match or if query contains plant name or vice versa
-        if (query_lower == plant_lower or 
-            query_lower in plant_lower or 
-            plant_lower in query_lower):
-            matching_plants.append(plant)
+    matched_lower = _find_plant_matches(query_lower, get_plant_name_index(plant_list))
+    matching_plants = {plant for plant, plant_lower in zip(plant_list, get_plant_names_lower(plant_list))
+                       if plant_lower in matched_lower}
     
     # If we found matches, include them plus some context plants
     if matching_plants:
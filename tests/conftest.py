@@ -0,0 +1,41 @@
+"""
+Shared pytest fixtures for the GardenLLM test suite.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the parent directory to the path so project modules can be imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def climate():
+    """Import the climate_config module once per test session (once per xdist worker)."""
+    import climate_config
+    return climate_config
+
+
+@pytest.fixture(scope='session')
+def web_module():
+    """Import the Flask app module once per test session; sys.modules serves later imports."""
+    import web
+    return web
+
+
+@pytest.fixture
+def manager():
+    """Fresh ConversationManager per test; the tiktoken encoder is shared via a module-level cache."""
+    from conversation_manager import ConversationManager
+    return ConversationManager()
+
+
+@pytest.fixture(autouse=True)
+def _clear_query_analysis_cache():
+    """Forget cached query analyses so each test sees the AI mock it patches in."""
+    query_analyzer = sys.modules.get('query_analyzer')
+    if query_analyzer is not None:
+        query_analyzer._analyze_database_query.cache_clear()
+    yield
@@ -8,25 +8,33 @@ it works correctly after being moved to its own module.
 
 import sys
 import os
+import itertools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import time
 
 # Add the parent directory to the path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from conversation_manager import ConversationManager
+from conversation_manager import ConversationManager, MAX_TOKENS, TOKEN_BUFFER
 
 # Set up logging for tests
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def test_conversation_creation():
+# Counter making conversation IDs unique even when tests run concurrently
+_counter = itertools.count()
+
+def _make_test_id(prefix="test"):
+    """Return a cheap, collision-free conversation ID for a test."""
+    return f"{prefix}_{time.monotonic_ns()}_{next(_counter)}"
+
+def test_conversation_creation(manager):
     """Test basic conversation creation and message addition"""
     logger.info("Testing conversation creation...")
     
-    manager = ConversationManager()
-    test_id = f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    test_id = _make_test_id()
     
     # Test adding a message to a new conversation
     test_message = {"role": "user", "content": "Hello, this is a test message"}
@@ -40,12 +48,11 @@ def test_conversation_creation():
     logger.info("✅ Conversation creation test passed")
     return True
 
-def test_multiple_messages():
+def test_multiple_messages(manager):
     """Test adding multiple messages to a conversation"""
     logger.info("Testing multiple messages...")
     
-    manager = ConversationManager()
-    test_id = f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    test_id = _make_test_id()
     
     # Add multiple messages
     messages_to_add = [
@@ -63,19 +70,18 @@ def test_multiple_messages():
     assert len(retrieved_messages) == 4, f"Expected 4 messages, got {len(retrieved_messages)}"
     
     # Verify message order and content
-    for i, expected in enumerate(messages_to_add):
-        assert retrieved_messages[i]["content"] == expected["content"], f"Message {i} content doesn't match"
-        assert retrieved_messages[i]["role"] == expected["role"], f"Message {i} role doesn't match"
+    for i, (actual, expected) in enumerate(zip(retrieved_messages, messages_to_add)):
+        assert actual["content"] == expected["content"], f"Message {i} content doesn't match"
+        assert actual["role"] == expected["role"], f"Message {i} role doesn't match"
     
     logger.info("✅ Multiple messages test passed")
     return True
 
-def test_conversation_timeout():
+def test_conversation_timeout(manager):
     """Test conversation timeout functionality"""
     logger.info("Testing conversation timeout...")
     
-    manager = ConversationManager()
-    test_id = f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    test_id = _make_test_id()
     
     # Add a message
     manager.add_message(test_id, {"role": "user", "content": "Test message"})
@@ -94,12 +100,11 @@ def test_conversation_timeout():
     logger.info("✅ Conversation timeout test passed")
     return True
 
-def test_token_counting():
+def test_token_counting(manager):
     """Test token counting functionality"""
     logger.info("Testing token counting...")
     
-    manager = ConversationManager()
-    test_id = f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    test_id = _make_test_id()
     
     # Add a message with known content
     test_message = {"role": "user", "content": "This is a test message for token counting"}
@@ -119,12 +124,11 @@ def test_token_counting():
     logger.info(f"✅ Token counting test passed. Tokens: {total_tokens} -> {new_total_tokens}")
     return True
 
-def test_message_trimming():
+def test_message_trimming(manager):
     """Test message trimming when token limit is exceeded"""
     logger.info("Testing message trimming...")
     
-    manager = ConversationManager()
-    test_id = f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    test_id = _make_test_id()
     
     # Add system message first
     system_message = {"role": "system", "content": "You are a helpful assistant."}
@@ -134,26 +138,84 @@ def test_message_trimming():
     long_content = "This is a very long message that contains many words and should contribute significantly to the token count. " * 50
     
     for i in range(10):
-        message = {"role": "user", "content": f"Long message {i}: {long_content}"}
-        manager.add_message(test_id, message)
+        # Only the short prefix varies; the shared long_content body is reused as-is
+        prefix = f"Long message {i}: "
+        manager.add_message(test_id, {"role": "user", "content": prefix + long_content})
     
     # Verify that messages were trimmed (should have fewer than 10 user messages)
     messages = manager.get_messages(test_id)
-    user_messages = [msg for msg in messages if msg["role"] == "user"]
+    user_message_count = sum(1 for msg in messages if msg["role"] == "user")
     
     # Should have system message + some user messages (trimmed)
     assert len(messages) < 12, f"Messages should be trimmed, got {len(messages)}"
-    assert len(user_messages) < 10, f"User messages should be trimmed, got {len(user_messages)}"
+    assert user_message_count < 10, f"User messages should be trimmed, got {user_message_count}"
+    
+    # Trimming is by token budget and drops the oldest message after the system prompt,
+    # so the system message survives and the newest message is still last
+    assert messages[0] == system_message, "System message should survive trimming"
+    assert messages[-1]["content"].startswith("Long message 9: "), "Newest message should be kept"
+    assert manager._get_total_tokens(test_id) <= MAX_TOKENS - TOKEN_BUFFER, "Conversation should fit the token budget"
     
     logger.info(f"✅ Message trimming test passed. Final message count: {len(messages)}")
     return True
 
-def test_clear_conversation():
+def test_batch_add_matches_sequential(manager):
+    """Test that add_messages stores the same result as adding messages one by one"""
+    logger.info("Testing batched message adds...")
+    
+    long_content = "This is a very long message that contains many words and should contribute significantly to the token count. " * 50
+    batch = [{"role": "system", "content": "You are a helpful assistant."}]
+    batch += [{"role": "user", "content": f"Long message {i} about my tomato: " + long_content} for i in range(10)]
+    
+    sequential_id, batched_id = _make_test_id(), _make_test_id()
+    for message in batch:
+        manager.add_message(sequential_id, message)
+    manager.add_messages(batched_id, batch)
+    
+    # Same surviving messages, token total and preview after trimming
+    assert manager.get_messages(batched_id) == manager.get_messages(sequential_id)
+    assert manager._get_total_tokens(batched_id) == manager._get_total_tokens(sequential_id)
+    sequential_preview = manager.get_conversation_preview(sequential_id)
+    batched_preview = manager.get_conversation_preview(batched_id)
+    assert batched_preview['plants_mentioned'] == sequential_preview['plants_mentioned']
+    assert batched_preview['key_topics'] == sequential_preview['key_topics']
+    
+    logger.info("✅ Batched message add test passed")
+    return True
+
+def test_trim_on_fixed_clock_refreshes_messages():
+    """Test that messages and previews see an append whose trim keeps the length unchanged on a stopped clock"""
+    logger.info("Testing trim + append on a fixed clock...")
+    
+    fixed = datetime(2024, 12, 1, 9, 0)
+    manager = ConversationManager(clock=lambda: fixed)
+    test_id = _make_test_id()
+    
+    # Only one of these fits the token budget next to the system message
+    big_content = "word " * ((MAX_TOKENS - TOKEN_BUFFER) // 2 + 100)
+    manager.add_message(test_id, {"role": "system", "content": "You are a helpful assistant."})
+    manager.add_message(test_id, {"role": "user", "content": big_content + "rose"})
+    manager.add_message(test_id, {"role": "user", "content": big_content + "tomato"})
+    assert manager.get_messages(test_id)[-1]["content"].endswith("tomato")
+    assert manager.get_conversation_preview(test_id)['plants_mentioned'] == ['tomato']
+    
+    # Same length and same last_activity after this append, but a different last message
+    manager.add_message(test_id, {"role": "user", "content": big_content + "basil"})
+    messages = manager.get_messages(test_id)
+    assert len(messages) == 2, f"Expected system + newest message, got {len(messages)}"
+    assert messages[-1]["content"].endswith("basil"), "Snapshot should reflect the trimmed conversation"
+    preview = manager.get_conversation_preview(test_id)
+    assert preview['plants_mentioned'] == ['basil'], "Preview should reflect the trimmed conversation"
+    assert preview['title'] == "About basil"
+    
+    logger.info("✅ Trim on fixed clock test passed")
+    return True
+
+def test_clear_conversation(manager):
     """Test clearing a conversation"""
     logger.info("Testing conversation clearing...")
     
-    manager = ConversationManager()
-    test_id = f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    test_id = _make_test_id()
     
     # Add some messages
     manager.add_message(test_id, {"role": "user", "content": "Test message"})
@@ -173,16 +235,14 @@ def test_clear_conversation():
     logger.info("✅ Conversation clearing test passed")
     return True
 
-def test_multiple_conversations():
+def test_multiple_conversations(manager):
     """Test managing multiple conversations simultaneously"""
     logger.info("Testing multiple conversations...")
     
-    manager = ConversationManager()
-    
     # Create multiple conversations
     conversations = []
     for i in range(3):
-        conv_id = f"test_conv_{i}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        conv_id = _make_test_id(f"test_conv_{i}")
         manager.add_message(conv_id, {"role": "user", "content": f"Message from conversation {i}"})
         conversations.append(conv_id)
     
@@ -216,7 +276,7 @@ def test_plant_vision_integration():
         assert isinstance(conversation_manager, ConversationManager), "conversation_manager should be ConversationManager instance"
         
         # Test basic functionality
-        test_id = f"plant_vision_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        test_id = _make_test_id("plant_vision_test")
         conversation_manager.add_message(test_id, {"role": "user", "content": "Plant vision test message"})
         
         messages = conversation_manager.get_messages(test_id)
@@ -240,6 +300,8 @@ def main():
         ("Conversation Timeout", test_conversation_timeout),
         ("Token Counting", test_token_counting),
         ("Message Trimming", test_message_trimming),
+        ("Batched Message Adds", test_batch_add_matches_sequential),
+        ("Trim On Fixed Clock", test_trim_on_fixed_clock_refreshes_messages),
         ("Clear Conversation", test_clear_conversation),
         ("Multiple Conversations", test_multiple_conversations),
         ("Plant Vision Integration", test_plant_vision_integration),
@@ -248,16 +310,27 @@ def main():
     passed = 0
     total = len(tests)
     
-    for test_name, test_func in tests:
+    def run_test(test_name, test_func):
+        """Run one test and return whether it passed."""
         logger.info(f"\n🔍 Testing: {test_name}")
         try:
-            if test_func():
+            # Outside pytest, supply the fresh manager the conftest fixture would provide
+            if test_func.__code__.co_argcount:
+                return bool(test_func(ConversationManager()))
+            return bool(test_func())
+        except Exception as e:
+            logger.error(f"❌ {test_name}: ERROR - {e}")
+            return False
+    
+    # Tests share no state, so run them concurrently and report in declaration order
+    with ThreadPoolExecutor(max_workers=total) as executor:
+        futures = [(test_name, executor.submit(run_test, test_name, test_func)) for test_name, test_func in tests]
+        for test_name, future in futures:
+            if future.result():
                 passed += 1
                 logger.info(f"✅ {test_name}: PASSED")
             else:
                 logger.error(f"❌ {test_name}: FAILED")
-        except Exception as e:
-            logger.error(f"❌ {test_name}: ERROR - {e}")
     
     logger.info("\n" + "=" * 50)
     logger.info(f"📊 Test Results: {passed}/{total} tests passed")
@@ -8,16 +8,52 @@ in the requirements document.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import json
-import time
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Maximum number of /chat requests in flight at once
+MAX_CONCURRENT_REQUESTS = 4
+
 class DatabaseOperationsTest:
+    # Keywords indicating AI-generated care information / Houston climate context
+    CARE_RE = re.compile(r"watering|light|soil|temperature|fertilizing|pruning", re.IGNORECASE)
+    HOUSTON_RE = re.compile(r"houston|zone 9|texas|humidity", re.IGNORECASE)
+    
+    # Care sections expected in comprehensive AI care information, one named group per section
+    CARE_SECTIONS_RE = re.compile(
+        r"(?P<watering>water|watering|moisture)"
+        r"|(?P<light>light|sun|shade|exposure)"
+        r"|(?P<soil>soil|drainage|ph)"
+        r"|(?P<temperature>temperature|heat|cold|frost)"
+        r"|(?P<fertilizing>fertilizer|fertilizing|nutrients)"
+        r"|(?P<pruning>prune|pruning|trim)"
+        r"|(?P<spacing>space|spacing|distance)",
+        re.IGNORECASE,
+    )
+    
     def __init__(self, base_url="https://gardenllm-server.onrender.com"):
         """Initialize database operations test suite."""
         self.base_url = base_url
+        # One keep-alive session for every request, pooled for the concurrent workers
+        self.session = requests.Session()
+        # Back off only when the server actually asks (429/503 with Retry-After)
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 503],
+                      allowed_methods=frozenset(["GET", "POST"]),
+                      respect_retry_after_header=True)
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=8, pool_maxsize=8)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.test_results = []
         self.start_time = datetime.now()
+        self._results_lock = threading.Lock()
+        self._log_buf = []  # Console lines, written out in one go by flush_log
+        self._jsonl = None  # JSON-lines progress log, open while run_all_tests is running
         
     def log_test(self, test_name, status, details=""):
         """Log test results with timestamp."""
@@ -28,32 +64,48 @@ class DatabaseOperationsTest:
             "status": status,
             "details": details
         }
-        self.test_results.append(result)
-        print(f"[{timestamp}] {test_name}: {status}")
+        line = f"[{timestamp}] {test_name}: {status}\n"
         if details:
-            print(f"  Details: {details}")
+            line += f"  Details: {details}\n"
+        with self._results_lock:
+            self.test_results.append(result)
+            if self._jsonl is not None:
+                # Append each result as it is logged so a crashed run keeps its results
+                self._jsonl.write(json.dumps(result) + "\n")
+            self._log_buf.append(line)
+    
+    def flush_log(self):
+        """Write buffered console log lines to stdout in a single call."""
+        with self._results_lock:
+            sys.stdout.writelines(self._log_buf)
+            self._log_buf.clear()
+        sys.stdout.flush()
+    
+    def _run_concurrently(self, check, items):
+        """Run check(item) for every item with bounded concurrency (the requests are I/O-bound)."""
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            list(executor.map(check, items))
     
     def test_exact_add_plant_command_format(self):
         """Test the exact add plant command format: 'Add/Update plant [plant name]'."""
         test_plants = ["tomato", "rosemary", "basil", "pepper"]
         
-        for plant in test_plants:
+        def check(plant):
             try:
                 command = f"Add/Update plant {plant}"
                 data = {"message": command}
                 
-                response = requests.post(f"{self.base_url}/chat", json=data, timeout=30)
+                response = self.session.post(f"{self.base_url}/chat", json=data, timeout=30)
                 
                 if response.status_code == 200:
                     result = response.json()
                     response_text = result.get("response", "")
                     
                     # Check for AI-generated care information
-                    care_keywords = ["watering", "light", "soil", "temperature", "fertilizing", "pruning"]
-                    care_info_present = any(keyword in response_text.lower() for keyword in care_keywords)
+                    care_info_present = bool(self.CARE_RE.search(response_text))
                     
                     # Check for Houston climate context
-                    houston_context = any(indicator in response_text.lower() for indicator in ["houston", "zone 9", "texas", "humidity"])
+                    houston_context = bool(self.HOUSTON_RE.search(response_text))
                     
                     if care_info_present:
                         self.log_test(f"Add Plant Command - {plant}", "PASS", 
@@ -73,32 +125,31 @@ class DatabaseOperationsTest:
                     self.log_test(f"Add Plant Command - {plant}", "FAIL", 
                                 f"Status code: {response.status_code}")
                 
-                time.sleep(1)  # Rate limiting consideration
-                
             except Exception as e:
                 self.log_test(f"Add Plant Command - {plant}", "FAIL", f"Error: {str(e)}")
+        
+        self._run_concurrently(check, test_plants)
     
     def test_exact_update_plant_command_format(self):
         """Test the exact update plant command format: 'Add/Update [plant name]'."""
         test_plants = ["tomato", "rosemary", "basil", "pepper"]
         
-        for plant in test_plants:
+        def check(plant):
             try:
                 command = f"Add/Update {plant}"
                 data = {"message": command}
                 
-                response = requests.post(f"{self.base_url}/chat", json=data, timeout=30)
+                response = self.session.post(f"{self.base_url}/chat", json=data, timeout=30)
                 
                 if response.status_code == 200:
                     result = response.json()
                     response_text = result.get("response", "")
                     
                     # Check for AI-generated care information
-                    care_keywords = ["watering", "light", "soil", "temperature", "fertilizing", "pruning"]
-                    care_info_present = any(keyword in response_text.lower() for keyword in care_keywords)
+                    care_info_present = bool(self.CARE_RE.search(response_text))
                     
                     # Check for Houston climate context
-                    houston_context = any(indicator in response_text.lower() for indicator in ["houston", "zone 9", "texas", "humidity"])
+                    houston_context = bool(self.HOUSTON_RE.search(response_text))
                     
                     if care_info_present:
                         self.log_test(f"Update Plant Command - {plant}", "PASS", 
@@ -118,10 +169,10 @@ class DatabaseOperationsTest:
                     self.log_test(f"Update Plant Command - {plant}", "FAIL", 
                                 f"Status code: {response.status_code}")
                 
-                time.sleep(1)  # Rate limiting consideration
-                
             except Exception as e:
                 self.log_test(f"Update Plant Command - {plant}", "FAIL", f"Error: {str(e)}")
+        
+        self._run_concurrently(check, test_plants)
     
     def test_optional_fields_handling(self):
         """Test that optional fields (location, photo URL) are handled correctly."""
@@ -140,20 +191,22 @@ class DatabaseOperationsTest:
             }
         ]
         
-        for test_case in test_cases:
+        def check(test_case):
             try:
                 data = {"message": test_case["command"]}
-                response = requests.post(f"{self.base_url}/chat", json=data, timeout=30)
+                response = self.session.post(f"{self.base_url}/chat", json=data, timeout=30)
                 
                 if response.status_code == 200:
                     result = response.json()
                     response_text = result.get("response", "")
                     
                     # Check if optional fields are acknowledged
-                    if "location" in test_case["command"].lower() and "location" in response_text.lower():
+                    command_lower = test_case["command"].lower()
+                    response_text_lower = response_text.lower()
+                    if "location" in command_lower and "location" in response_text_lower:
                         self.log_test(f"Optional Field - {test_case['expected_field']}", "PASS", 
                                     f"Location field handled correctly")
-                    elif "photo" in test_case["command"].lower() and "photo" in response_text.lower():
+                    elif "photo" in command_lower and "photo" in response_text_lower:
                         self.log_test(f"Optional Field - {test_case['expected_field']}", "PASS", 
                                     f"Photo URL field handled correctly")
                     else:
@@ -164,10 +217,10 @@ class DatabaseOperationsTest:
                     self.log_test(f"Optional Field - {test_case['expected_field']}", "FAIL", 
                                 f"Status code: {response.status_code}")
                 
-                time.sleep(1)  # Rate limiting consideration
-                
             except Exception as e:
                 self.log_test(f"Optional Field - {test_case['expected_field']}", "FAIL", f"Error: {str(e)}")
+        
+        self._run_concurrently(check, test_cases)
     
     def test_ai_care_information_generation(self):
         """Test that AI generates comprehensive care information."""
@@ -177,29 +230,15 @@ class DatabaseOperationsTest:
             command = f"Add/Update plant {test_plant}"
             data = {"message": command}
             
-            response = requests.post(f"{self.base_url}/chat", json=data, timeout=30)
+            response = self.session.post(f"{self.base_url}/chat", json=data, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
                 response_text = result.get("response", "")
                 
-                # Check for comprehensive care information
-                care_sections = {
-                    "watering": ["water", "watering", "moisture"],
-                    "light": ["light", "sun", "shade", "exposure"],
-                    "soil": ["soil", "drainage", "ph"],
-                    "temperature": ["temperature", "heat", "cold", "frost"],
-                    "fertilizing": ["fertilizer", "fertilizing", "nutrients"],
-                    "pruning": ["prune", "pruning", "trim"],
-                    "spacing": ["space", "spacing", "distance"]
-                }
-                
-                sections_found = 0
-                total_sections = len(care_sections)
-                
-                for section, keywords in care_sections.items():
-                    if any(keyword in response_text.lower() for keyword in keywords):
-                        sections_found += 1
+                # Check for comprehensive care information in a single scan
+                sections_found = len({match.lastgroup for match in self.CARE_SECTIONS_RE.finditer(response_text)})
+                total_sections = self.CARE_SECTIONS_RE.groups
                 
                 coverage_percentage = (sections_found / total_sections) * 100
                 
@@ -219,38 +258,63 @@ class DatabaseOperationsTest:
     
     def test_database_query_commands(self):
         """Test database query functionality."""
-        query_commands = [
-            "Show me my plants",
-            "What plants do I have?",
-            "List my garden plants",
-            "What's in my garden database?"
-        ]
+        # Each query and the handler stage it must be routed to
+        query_commands = {
+            "Show me my plants": "query_analyzer",
+            "What plants do I have?": "query_analyzer",
+            "List my garden plants": "query_analyzer",
+            "What's in my garden database?": "query_analyzer",
+            "What plants are in the patio?": "location_plants"
+        }
         
-        for command in query_commands:
+        def check(command):
+            expected_route = query_commands[command]
             try:
-                data = {"message": command}
-                response = requests.post(f"{self.base_url}/chat", json=data, timeout=30)
+                # Dry run: the server reports the routed handler without calling the LLM
+                data = {"message": command, "dry_run": True}
+                response = self.session.post(f"{self.base_url}/chat", json=data, timeout=30)
                 
                 if response.status_code == 200:
-                    result = response.json()
-                    response_text = result.get("response", "")
+                    route = response.json().get("route")
                     
-                    # Check for database-related response
-                    if "plant" in response_text.lower() or "garden" in response_text.lower():
+                    # Check that the query reached the expected chat handler
+                    if route == expected_route:
                         self.log_test(f"Database Query - '{command}'", "PASS", 
-                                    "Database query functionality working")
+                                    f"Database query routed to {route}")
                     else:
-                        self.log_test(f"Database Query - '{command}'", "WARNING", 
-                                    "Database query working but response format unclear")
+                        self.log_test(f"Database Query - '{command}'", "FAIL", 
+                                    f"Expected route {expected_route}, got {route}")
                         
                 else:
                     self.log_test(f"Database Query - '{command}'", "FAIL", 
                                 f"Status code: {response.status_code}")
                 
-                time.sleep(1)  # Rate limiting consideration
-                
             except Exception as e:
                 self.log_test(f"Database Query - '{command}'", "FAIL", f"Error: {str(e)}")
+        
+        self._run_concurrently(check, query_commands)
+        
+        # One live query to confirm the database is actually read and listed
+        command = "Show me my plants"
+        try:
+            response = self.session.post(f"{self.base_url}/chat", json={"message": command}, timeout=30)
+            
+            if response.status_code == 200:
+                response_text_lower = response.json().get("response", "").lower()
+                
+                # Check for database-related response
+                if "plant" in response_text_lower or "garden" in response_text_lower:
+                    self.log_test(f"Database Query Response - '{command}'", "PASS", 
+                                "Database query functionality working")
+                else:
+                    self.log_test(f"Database Query Response - '{command}'", "WARNING", 
+                                "Database query working but response format unclear")
+            else:
+                self.log_test(f"Database Query Response - '{command}'", "FAIL", 
+                            f"Status code: {response.status_code}")
+            
+        except Exception as e:
+            self.log_test(f"Database Query Response - '{command}'", "FAIL", f"Error: {str(e)}")
     
     def test_command_format_preservation(self):
         """Test that only the exact command formats work."""
@@ -262,18 +326,17 @@ class DatabaseOperationsTest:
             "Change tomato location to backyard"
         ]
         
-        for command in invalid_commands:
+        def check(command):
             try:
-                data = {"message": command}
-                response = requests.post(f"{self.base_url}/chat", json=data, timeout=30)
+                # Only the routing decision matters here, so skip response generation
+                data = {"message": command, "dry_run": True}
+                response = self.session.post(f"{self.base_url}/chat", json=data, timeout=30)
                 
                 if response.status_code == 200:
-                    result = response.json()
-                    response_text = result.get("response", "")
-                    
                     # These commands should not trigger add/update functionality
                     # They should be treated as general gardening questions
-                    if "add" in command.lower() and "plant" in command.lower():
+                    command_lower = command.lower()
+                    if "add" in command_lower and "plant" in command_lower:
                         # This might still work if the system is flexible
                         self.log_test(f"Invalid Command - '{command}'", "INFO", 
                                     "Command format flexibility detected")
@@ -285,10 +348,10 @@ class DatabaseOperationsTest:
                     self.log_test(f"Invalid Command - '{command}'", "FAIL", 
                                 f"Status code: {response.status_code}")
                 
-                time.sleep(1)  # Rate limiting consideration
-                
             except Exception as e:
                 self.log_test(f"Invalid Command - '{command}'", "FAIL", f"Error: {str(e)}")
+        
+        self._run_concurrently(check, invalid_commands)
     
     def run_all_tests(self):
         """Run all database operation tests and generate report."""
@@ -309,11 +372,18 @@ class DatabaseOperationsTest:
             self.test_command_format_preservation
         ]
         
-        for test in tests:
-            try:
-                test()
-            except Exception as e:
-                self.log_test(test.__name__, "ERROR", f"Test execution error: {str(e)}")
+        self._jsonl = open(self._results_filename("jsonl"), 'w', buffering=1)
+        try:
+            for test in tests:
+                try:
+                    test()
+                except Exception as e:
+                    self.log_test(test.__name__, "ERROR", f"Test execution error: {str(e)}")
+        finally:
+            self._jsonl.close()
+            self._jsonl = None
+        
+        self.flush_log()
         
         # Generate summary
         end_time = datetime.now()
@@ -338,10 +408,14 @@ class DatabaseOperationsTest:
         
         return passed, failed, warnings
     
+    def _results_filename(self, extension):
+        """Return the results file name for this run with the given extension."""
+        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
+        return f"database_operations_test_results_{timestamp}.{extension}"
+    
     def save_results(self):
         """Save test results to file."""
-        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
-        filename = f"database_operations_test_results_{timestamp}.json"
+        filename = self._results_filename("json")
         
         results = {
             "test_run": {
@@ -359,7 +433,6 @@ class DatabaseOperationsTest:
 
 if __name__ == "__main__":
     # Allow command line override of base URL
-    import sys
     base_url = sys.argv[1] if len(sys.argv) > 1 else "https://gardenllm-server.onrender.com"
     
     tester = DatabaseOperationsTest(base_url)
@@ -11,8 +11,10 @@ This test suite verifies the enhanced conversation history functionality includi
 """
 
 import unittest
+import itertools
 import json
 import time
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 import os
 import sys
@@ -22,22 +24,35 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from conversation_manager import ConversationManager
 
+# Per-test progress output is opt-in: TEST_VERBOSE=1 python -m pytest ...
+_VERBOSE = os.environ.get('TEST_VERBOSE') == '1'
+_log = print if _VERBOSE else (lambda *args, **kwargs: None)
+
 
 class EnhancedConversationHistoryTests(unittest.TestCase):
     """Test suite for enhanced conversation history functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one conversation manager shared by every test in the class"""
+        # Counter-based IDs are unique within the run and skip UUID generation
+        id_counter = itertools.count()
+        cls.conversation_manager = ConversationManager(
+            id_generator=lambda mode: f"test-{mode}-{next(id_counter)}"
+        )
+    
     def setUp(self):
         """Set up test environment"""
-        print(f"\n{'='*60}")
-        print(f"Enhanced Conversation History Test: {self._testMethodName}")
-        print(f"{'='*60}")
+        _log(f"\n{'='*60}")
+        _log(f"Enhanced Conversation History Test: {self._testMethodName}")
+        _log(f"{'='*60}")
         
-        # Initialize conversation manager
-        self.conversation_manager = ConversationManager()
+        # Start each test from an empty conversation store
+        self.conversation_manager.clear_all_conversations()
     
     def test_conversation_preview_generation(self):
         """Test conversation preview generation with meaningful content"""
-        print("Testing conversation preview generation...")
+        _log("Testing conversation preview generation...")
         
         conversation_id = self.conversation_manager.generate_conversation_id()
         
@@ -74,11 +89,11 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
         self.assertEqual(preview['message_count'], 3)
         self.assertEqual(preview['mode'], 'database')
         
-        print("PASS: Conversation preview generation test passed")
+        _log("PASS: Conversation preview generation test passed")
     
     def test_plant_extraction_from_conversations(self):
         """Test extraction of plant names from conversations"""
-        print("Testing plant extraction from conversations...")
+        _log("Testing plant extraction from conversations...")
         
         conversation_id = self.conversation_manager.generate_conversation_id()
         
@@ -100,11 +115,11 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
         self.assertIn('tomato', preview['title'].lower())
         self.assertIn('pepper', preview['title'].lower())
         
-        print("PASS: Plant extraction from conversations test passed")
+        _log("PASS: Plant extraction from conversations test passed")
     
     def test_action_detection_in_conversations(self):
         """Test detection of actions in conversations"""
-        print("Testing action detection in conversations...")
+        _log("Testing action detection in conversations...")
         
         conversation_id = self.conversation_manager.generate_conversation_id()
         
@@ -134,11 +149,11 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
         self.assertIn('Plant identification', preview['actions'])
         self.assertIn('Location query', preview['actions'])
         
-        print("PASS: Action detection in conversations test passed")
+        _log("PASS: Action detection in conversations test passed")
     
     def test_topic_extraction_from_conversations(self):
         """Test extraction of key topics from conversations"""
-        print("Testing topic extraction from conversations...")
+        _log("Testing topic extraction from conversations...")
         
         conversation_id = self.conversation_manager.generate_conversation_id()
         
@@ -163,11 +178,11 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
         # Note: 'care' might not be detected if it's not in the exact form expected
         # The message contains "How much water do my plants need?" which doesn't contain "care"
         
-        print("PASS: Topic extraction from conversations test passed")
+        _log("PASS: Topic extraction from conversations test passed")
     
     def test_conversation_history_summary_generation(self):
         """Test generation of user-friendly conversation history summaries"""
-        print("Testing conversation history summary generation...")
+        _log("Testing conversation history summary generation...")
         
         conversation_id = self.conversation_manager.generate_conversation_id()
         
@@ -205,11 +220,11 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
         self.assertIn('Care advice', summary['actions'])
         self.assertEqual(summary['conversation_id'], conversation_id)
         
-        print("PASS: Conversation history summary generation test passed")
+        _log("PASS: Conversation history summary generation test passed")
     
     def test_empty_conversation_handling(self):
         """Test handling of empty conversations"""
-        print("Testing empty conversation handling...")
+        _log("Testing empty conversation handling...")
         
         conversation_id = self.conversation_manager.generate_conversation_id()
         
@@ -229,11 +244,11 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
         self.assertEqual(summary['title'], 'No conversation')
         self.assertEqual(summary['message_count'], 0)
         
-        print("PASS: Empty conversation handling test passed")
+        _log("PASS: Empty conversation handling test passed")
     
     def test_invalid_conversation_handling(self):
         """Test handling of invalid conversation IDs"""
-        print("Testing invalid conversation handling...")
+        _log("Testing invalid conversation handling...")
         
         # Test with invalid conversation ID
         preview = self.conversation_manager.get_conversation_preview('invalid_id')
@@ -248,11 +263,11 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
         self.assertEqual(summary['title'], 'No conversation')
         self.assertEqual(summary['message_count'], 0)
         
-        print("PASS: Invalid conversation handling test passed")
+        _log("PASS: Invalid conversation handling test passed")
     
     def test_conversation_summary_length_limits(self):
         """Test that conversation summaries respect length limits"""
-        print("Testing conversation summary length limits...")
+        _log("Testing conversation summary length limits...")
         
         conversation_id = self.conversation_manager.generate_conversation_id()
         
@@ -273,11 +288,11 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
         self.assertLess(len(preview['summary']), 500)
         self.assertLess(len(summary['summary']), 500)
         
-        print("PASS: Conversation summary length limits test passed")
+        _log("PASS: Conversation summary length limits test passed")
     
     def test_multiple_plants_in_title_generation(self):
         """Test title generation with multiple plants"""
-        print("Testing multiple plants in title generation...")
+        _log("Testing multiple plants in title generation...")
         
         conversation_id = self.conversation_manager.generate_conversation_id()
         
@@ -298,29 +313,30 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
         self.assertIn('pepper', preview['title'].lower())
         self.assertIn('and', preview['title'].lower())  # Should have "and X more" format
         
-        print("PASS: Multiple plants in title generation test passed")
+        _log("PASS: Multiple plants in title generation test passed")
     
     def test_conversation_summary_sorting(self):
         """Test that conversation summaries can be sorted by activity"""
-        print("Testing conversation summary sorting...")
+        _log("Testing conversation summary sorting...")
         
-        # Create multiple conversations with different timestamps
+        # Create multiple conversations with different timestamps; the manager's clock is
+        # replaced by one that advances a second per call, so no real waiting is needed
         conversations = []
-        for i in range(3):
-            conversation_id = self.conversation_manager.generate_conversation_id()
-            self.conversation_manager.add_message(conversation_id, {
-                'role': 'user',
-                'content': f'Conversation {i} about plants',
-                'mode': 'database'
-            })
-            conversations.append(conversation_id)
-            time.sleep(0.1)  # Ensure different timestamps
+        start = datetime.now()
+        ticks = itertools.count()
+        with patch('conversation_manager.datetime') as mock_datetime:
+            mock_datetime.now.side_effect = lambda: start + timedelta(seconds=next(ticks))
+            for i in range(3):
+                conversation_id = self.conversation_manager.generate_conversation_id()
+                self.conversation_manager.add_message(conversation_id, {
+                    'role': 'user',
+                    'content': f'Conversation {i} about plants',
+                    'mode': 'database'
+                })
+                conversations.append(conversation_id)
         
         # Get summaries for all conversations
-        summaries = []
-        for conv_id in conversations:
-            summary = self.conversation_manager.get_conversation_history_summary(conv_id)
-            summaries.append(summary)
+        summaries = self.conversation_manager.bulk_get_summaries(conversations)
         
         # Sort by last activity (most recent first)
         summaries.sort(key=lambda x: x.get('last_activity', time.time()), reverse=True)
@@ -331,11 +347,11 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
             summaries[1]['last_activity']
         )
         
-        print("PASS: Conversation summary sorting test passed")
+        _log("PASS: Conversation summary sorting test passed")
     
     def test_performance_of_summary_generation(self):
         """Test performance of summary generation"""
-        print("Testing performance of summary generation...")
+        _log("Testing performance of summary generation...")
         
         conversation_id = self.conversation_manager.generate_conversation_id()
         
@@ -366,43 +382,10 @@ class EnhancedConversationHistoryTests(unittest.TestCase):
         self.assertIn('pepper', preview['plants_mentioned'])
         self.assertEqual(preview['message_count'], 50)
         
-        print("PASS: Performance of summary generation test passed")
-
-
-def run_enhanced_conversation_history_tests():
-    """Run all enhanced conversation history tests"""
-    print("\n" + "="*80)
-    print("ENHANCED CONVERSATION HISTORY TEST SUITE")
-    print("="*80)
-    
-    # Create test suite
-    test_suite = unittest.TestLoader().loadTestsFromTestCase(EnhancedConversationHistoryTests)
-    
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(test_suite)
-    
-    # Print summary
-    print("\n" + "="*80)
-    print("TEST SUMMARY")
-    print("="*80)
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    
-    if result.failures:
-        print("\nFAILURES:")
-        for test, traceback in result.failures:
-            print(f"- {test}: {traceback}")
-    
-    if result.errors:
-        print("\nERRORS:")
-        for test, traceback in result.errors:
-            print(f"- {test}: {traceback}")
-    
-    return result.wasSuccessful()
+        _log("PASS: Performance of summary generation test passed")
 
 
 if __name__ == "__main__":
-    success = run_enhanced_conversation_history_tests()
-    sys.exit(0 if success else 1) 
\ No newline at end of file
+    # Run the tests in parallel across CPU cores (pytest-xdist, see requirements-dev.txt)
+    import pytest
+    sys.exit(pytest.main([__file__, "-n", "auto"]))
@@ -62,13 +62,11 @@ class TestFieldConfig(unittest.TestCase):
             self.assertIn(category, FIELD_CATEGORIES)
         
         # Test that all fields are assigned to categories
-        categorized_fields = []
-        for fields in FIELD_CATEGORIES.values():
-            categorized_fields.extend(fields)
+        categorized_set = {field for fields in FIELD_CATEGORIES.values() for field in fields}
         
         for field in FIELD_NAMES:
             if field != 'ID':  # ID might be in basic category
-                self.assertIn(field, categorized_fields, f"Field '{field}' not assigned to any category")
+                self.assertIn(field, categorized_set, f"Field '{field}' not assigned to any category")
 
     def test_get_canonical_field_name(self):
         """Test the get_canonical_field_name function."""
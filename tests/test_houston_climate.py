@@ -7,105 +7,217 @@ This test ensures that the mandatory Houston climate context is maintained
 throughout the four-mode system implementation.
 """
 
-import requests
-import json
+import orjson
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Console/report timestamp format, rendered with time.strftime (no datetime object per line)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Maximum number of requests in flight at once (replaces the old fixed 1s pause per request)
+MAX_CONCURRENT_REQUESTS = 4
+
+# Houston climate indicators by category (all lowercase)
+HOUSTON_INDICATORS = {
+    "houston": ["houston", "texas", "tx"],
+    "zone": ["zone 9", "zone 9a", "zone 9b"],
+    "temperature": ["90-100°f", "32-38°c", "30-40°f", "-1-4°c"],
+    "humidity": ["humidity", "humid", "60-80%"],
+    "soil": ["clay soil", "alkaline", "ph 7.0-8.0"],
+    "rainfall": ["50+ inches", "heavy spring", "heavy fall"],
+    "seasons": ["february-may", "september-november", "avoid peak summer"]
+}
+_INDICATOR_CATEGORY = {indicator: category
+                       for category, indicators in HOUSTON_INDICATORS.items()
+                       for indicator in indicators}
+
+# Categories of Houston context a chat response needs for a PASS
+MIN_CONTEXT_CATEGORIES = 2
+
+# One bit per category; a response's categories are the OR of its indicators' bits
+_CATEGORY_BIT = {category: 1 << index for index, category in enumerate(HOUSTON_INDICATORS)}
+
+# (indicator, category bit) pairs for batch scoring in score_responses
+_INDICATOR_BITS = tuple((indicator, _CATEGORY_BIT[category]) for indicator, category in _INDICATOR_CATEGORY.items())
+
+# Every indicator in one compiled pattern, so a response is scanned once. The zero-width
+# lookahead is tried at each position so overlapping indicators are all seen; alternatives
+# are longest first, and a match also counts the shorter indicators it starts with
+# ("humid" in "humidity") through _INDICATOR_MASK.
+_INDICATOR_RE = re.compile("(?=(" + "|".join(
+    re.escape(indicator) for indicator in sorted(_INDICATOR_CATEGORY, key=len, reverse=True)
+) + "))")
+_INDICATOR_MASK = {indicator: sum({_CATEGORY_BIT[_INDICATOR_CATEGORY[other]]
+                                   for other in _INDICATOR_CATEGORY if indicator.startswith(other)})
+                   for indicator in _INDICATOR_CATEGORY}
+
+# Houston context in weather-mode plant care advice, matched case-insensitively in one search
+_WEATHER_ADVICE_RE = re.compile(r"houston|zone 9|texas|humidity|clay soil|gulf coast", re.IGNORECASE)
+# Location mention used by the cross-endpoint consistency check
+_HOUSTON_RE = re.compile(r"houston|texas", re.IGNORECASE)
+
+# Request inputs for the tests below; each test maps one check over its table
+GARDENING_QUERIES = (
+    "How do I grow tomatoes?",
+    "What vegetables grow well in my area?",
+    "When should I plant peppers?",
+    "How often should I water my garden?",
+    "What soil amendments do I need?",
+    "How do I protect plants from frost?",
+    "What are good companion plants?",
+    "How do I fertilize my garden?"
+)
+TEST_PLANTS = ("tomato", "rosemary", "basil", "pepper", "lettuce", "carrots")
+# (category, query, indicators expected in the answer)
+SPECIFIC_INDICATOR_QUERIES = (
+    ("planting time", "What's the best time to plant tomatoes in my area?", ("february", "march", "spring", "fall")),
+    ("humidity", "How do I deal with the humidity in my garden?", ("humidity", "humid", "60-80%")),
+    ("soil", "What soil type do I have and how do I improve it?", ("clay", "alkaline", "ph 7.0-8.0")),
+    ("frost", "When is the last frost date in my area?", ("november", "march", "freeze", "frost")),
+    ("heat", "How do I protect plants from the summer heat?", ("summer", "90-100°f", "heat", "hot"))
+)
+
 class HoustonClimateTest:
     def __init__(self, base_url="https://gardenllm-server.onrender.com"):
         """Initialize Houston climate test suite."""
         self.base_url = base_url
+        # requests pulls in urllib3, ssl and charset detection; import it only when a suite is
+        # actually built, not when the module is merely imported (e.g. pytest collection)
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util import Retry
+        
+        # One keep-alive session for every request, pooled for the concurrent workers
+        self.session = requests.Session()
+        # No fixed pause between requests: back off only when the server throttles (429/503),
+        # waiting as long as its Retry-After header asks before retrying
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 503],
+                      allowed_methods=frozenset(["GET", "POST"]),
+                      respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.test_results = []
         self.start_time = datetime.now()
+        self._results_lock = threading.Lock()  # Results and console lines come from worker threads
+        self._log_fp = None  # JSON-lines progress log, open while run_all_tests is running
+        # One request pool shared by every test, so concurrent tests still keep at most
+        # MAX_CONCURRENT_REQUESTS requests in flight; created per run by run_all_tests
+        self._request_pool = None
+        self._weather = None
+        self._weather_lock = threading.Lock()
         
     def log_test(self, test_name, status, details=""):
         """Log test results with timestamp."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime(TIMESTAMP_FORMAT)
         result = {
             "timestamp": timestamp,
             "test": test_name,
             "status": status,
             "details": details
         }
-        self.test_results.append(result)
-        print(f"[{timestamp}] {test_name}: {status}")
+        line = f"[{timestamp}] {test_name}: {status}"
         if details:
-            print(f"  Details: {details}")
+            line += f"\n  Details: {details}"
+        with self._results_lock:
+            self.test_results.append(result)
+            print(line)
+            if self._log_fp is not None:
+                # Append each result as it completes so an interrupted run keeps what it had
+                self._log_fp.write(orjson.dumps(result) + b"\n")
+                self._log_fp.flush()
     
-    def check_houston_context(self, response_text):
-        """Check for Houston climate context indicators in response text."""
-        houston_indicators = {
-            "houston": ["houston", "texas", "tx"],
-            "zone": ["zone 9", "zone 9a", "zone 9b"],
-            "temperature": ["90-100°f", "32-38°c", "30-40°f", "-1-4°c"],
-            "humidity": ["humidity", "humid", "60-80%"],
-            "soil": ["clay soil", "alkaline", "ph 7.0-8.0"],
-            "rainfall": ["50+ inches", "heavy spring", "heavy fall"],
-            "seasons": ["february-may", "september-november", "avoid peak summer"]
-        }
+    def _run_concurrently(self, check, items):
+        """Run check(item) for every item on the shared request pool and return the results in order."""
+        return list(self._request_pool.map(check, items))
+    
+    def _request_json(self, method, endpoint, data=None):
+        """Send one request and return (status_code, decoded JSON body or None)."""
+        if method == "GET":
+            response = self.session.get(f"{self.base_url}{endpoint}", timeout=30)
+        else:
+            response = self.session.post(f"{self.base_url}{endpoint}", json=data, timeout=30)
+        result = orjson.loads(response.content) if response.status_code == 200 else None
+        return response.status_code, result
+    
+    @property
+    def weather_response(self):
+        """GET /api/weather once per run; (status_code, body) is shared by the weather-based tests.
         
-        context_found = {}
-        total_indicators = 0
-        found_indicators = 0
+        The tests run concurrently, so the first caller fetches under a lock and the rest wait
+        for its result. Set self._weather = None to refetch.
+        """
+        with self._weather_lock:
+            if self._weather is None:
+                self._weather = self._request_json("GET", "/api/weather")
+            return self._weather
+    
+    def check_houston_context(self, response_text, min_categories=None):
+        """Return a bitmask of the Houston climate categories present in response text.
+        
+        Bits follow _CATEGORY_BIT; mask.bit_count() is the number of categories found.
+        With min_categories, scanning stops as soon as that many categories are found.
+        """
+        context_found = 0
+        for match in _INDICATOR_RE.finditer(response_text.lower()):
+            context_found |= _INDICATOR_MASK[match.group(1)]
+            if min_categories is not None and context_found.bit_count() >= min_categories:
+                break
+        return context_found
+    
+    def score_responses(self, response_texts):
+        """Return the check_houston_context bitmask of each response, scoring the batch at once.
         
-        for category, indicators in houston_indicators.items():
-            category_found = False
-            for indicator in indicators:
-                if indicator in response_text.lower():
-                    category_found = True
-                    found_indicators += 1
-                total_indicators += 1
-            context_found[category] = category_found
+        Runs one vectorized substring search per indicator across all responses, so the cost
+        grows with the number of indicators rather than the number of responses.
+        """
+        import numpy as np  # Only needed when responses are scored in bulk
         
-        return context_found, found_indicators, total_indicators
+        if not response_texts:
+            return []
+        texts = np.char.lower(np.array(response_texts, dtype=str))
+        masks = np.zeros(len(response_texts), dtype=np.int64)
+        for indicator, bit in _INDICATOR_BITS:
+            masks[np.char.find(texts, indicator) >= 0] |= bit
+        return masks.tolist()
     
     def test_general_gardening_houston_context(self):
         """Test Houston climate context in general gardening responses."""
-        gardening_queries = [
-            "How do I grow tomatoes?",
-            "What vegetables grow well in my area?",
-            "When should I plant peppers?",
-            "How often should I water my garden?",
-            "What soil amendments do I need?",
-            "How do I protect plants from frost?",
-            "What are good companion plants?",
-            "How do I fertilize my garden?"
-        ]
+        total_queries = len(GARDENING_QUERIES)
         
-        total_queries = len(gardening_queries)
-        houston_context_found = 0
-        
-        for query in gardening_queries:
+        def check(query):
+            """Return True when the response to query carries Houston context."""
             try:
                 data = {"message": query}
-                response = requests.post(f"{self.base_url}/chat", json=data, timeout=30)
+                response = self.session.post(f"{self.base_url}/chat", json=data, timeout=30)
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = orjson.loads(response.content)
                     response_text = result.get("response", "")
                     
-                    context_found, found_indicators, total_indicators = self.check_houston_context(response_text)
-                    
-                    # Check if at least 2 categories of Houston context are present
-                    categories_found = sum(context_found.values())
+                    # Check if at least 2 categories of Houston context are present; the scan
+                    # stops once they are, so a PASS reports the threshold rather than a full count
+                    categories_found = self.check_houston_context(response_text, MIN_CONTEXT_CATEGORIES).bit_count()
                     
-                    if categories_found >= 2:
-                        houston_context_found += 1
+                    if categories_found >= MIN_CONTEXT_CATEGORIES:
                         self.log_test(f"General Gardening - '{query[:30]}...'", "PASS", 
-                                    f"Houston context found ({categories_found} categories)")
-                    else:
-                        self.log_test(f"General Gardening - '{query[:30]}...'", "WARNING", 
-                                    f"Limited Houston context ({categories_found} categories)")
+                                    f"Houston context found (at least {categories_found} categories)")
+                        return True
+                    self.log_test(f"General Gardening - '{query[:30]}...'", "WARNING", 
+                                f"Limited Houston context ({categories_found} categories)")
                         
                 else:
                     self.log_test(f"General Gardening - '{query[:30]}...'", "FAIL", 
                                 f"Status code: {response.status_code}")
                 
-                time.sleep(1)  # Rate limiting consideration
-                
             except Exception as e:
                 self.log_test(f"General Gardening - '{query[:30]}...'", "FAIL", f"Error: {str(e)}")
+            return False
+        
+        houston_context_found = sum(self._run_concurrently(check, GARDENING_QUERIES))
         
         # Calculate overall success rate
         success_rate = (houston_context_found / total_queries) * 100
@@ -117,21 +229,15 @@ class HoustonClimateTest:
         """Test Houston climate context in weather mode responses."""
         try:
             # Test weather API endpoint
-            response = requests.get(f"{self.base_url}/api/weather", timeout=30)
+            status_code, result = self.weather_response
             
-            if response.status_code == 200:
-                result = response.json()
+            if status_code == 200:
                 plant_care_advice = result.get("plant_care_advice", [])
                 
                 # Check for Houston climate indicators in plant care advice
-                houston_indicators = ["houston", "zone 9", "texas", "humidity", "clay soil", "gulf coast"]
-                houston_context_found = 0
+                houston_context_found = sum(1 for advice in plant_care_advice if _WEATHER_ADVICE_RE.search(advice))
                 total_advice = len(plant_care_advice)
                 
-                for advice in plant_care_advice:
-                    if any(indicator in advice.lower() for indicator in houston_indicators):
-                        houston_context_found += 1
-                
                 context_percentage = (houston_context_found / total_advice) * 100 if total_advice > 0 else 0
                 
                 if context_percentage >= 30:  # At least 30% of advice should have Houston context
@@ -141,7 +247,7 @@ class HoustonClimateTest:
                     self.log_test("Weather Mode Houston Context", "WARNING", f"Houston context found in only {context_percentage:.1f}% of weather advice")
                     return True
             else:
-                self.log_test("Weather Mode Houston Context", "FAIL", f"Status code: {response.status_code}")
+                self.log_test("Weather Mode Houston Context", "FAIL", f"Status code: {status_code}")
                 return False
         except Exception as e:
             self.log_test("Weather Mode Houston Context", "FAIL", f"Error: {str(e)}")
@@ -149,43 +255,40 @@ class HoustonClimateTest:
     
     def test_add_plant_houston_context(self):
         """Test Houston climate context in add plant responses."""
-        test_plants = ["tomato", "rosemary", "basil", "pepper", "lettuce", "carrots"]
-        
-        total_plants = len(test_plants)
-        houston_context_found = 0
+        total_plants = len(TEST_PLANTS)
         
-        for plant in test_plants:
+        def check(plant):
+            """Return True when the add plant response for plant carries Houston context."""
             try:
                 command = f"Add/Update plant {plant}"
                 data = {"message": command}
                 
-                response = requests.post(f"{self.base_url}/chat", json=data, timeout=30)
+                response = self.session.post(f"{self.base_url}/chat", json=data, timeout=30)
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = orjson.loads(response.content)
                     response_text = result.get("response", "")
                     
-                    context_found, found_indicators, total_indicators = self.check_houston_context(response_text)
-                    
-                    # Check if at least 2 categories of Houston context are present
-                    categories_found = sum(context_found.values())
+                    # Check if at least 2 categories of Houston context are present; the scan
+                    # stops once they are, so a PASS reports the threshold rather than a full count
+                    categories_found = self.check_houston_context(response_text, MIN_CONTEXT_CATEGORIES).bit_count()
                     
-                    if categories_found >= 2:
-                        houston_context_found += 1
+                    if categories_found >= MIN_CONTEXT_CATEGORIES:
                         self.log_test(f"Add Plant - {plant}", "PASS", 
-                                    f"Houston context found ({categories_found} categories)")
-                    else:
-                        self.log_test(f"Add Plant - {plant}", "WARNING", 
-                                    f"Limited Houston context ({categories_found} categories)")
+                                    f"Houston context found (at least {categories_found} categories)")
+                        return True
+                    self.log_test(f"Add Plant - {plant}", "WARNING", 
+                                f"Limited Houston context ({categories_found} categories)")
                         
                 else:
                     self.log_test(f"Add Plant - {plant}", "FAIL", 
                                 f"Status code: {response.status_code}")
                 
-                time.sleep(1)  # Rate limiting consideration
-                
             except Exception as e:
                 self.log_test(f"Add Plant - {plant}", "FAIL", f"Error: {str(e)}")
+            return False
+        
+        houston_context_found = sum(self._run_concurrently(check, TEST_PLANTS))
         
         # Calculate overall success rate
         success_rate = (houston_context_found / total_plants) * 100
@@ -195,38 +298,20 @@ class HoustonClimateTest:
     
     def test_specific_houston_climate_indicators(self):
         """Test for specific Houston climate indicators in responses."""
-        test_queries = [
-            "What's the best time to plant tomatoes in my area?",
-            "How do I deal with the humidity in my garden?",
-            "What soil type do I have and how do I improve it?",
-            "When is the last frost date in my area?",
-            "How do I protect plants from the summer heat?"
-        ]
-        
-        expected_indicators = {
-            "planting time": ["february", "march", "spring", "fall"],
-            "humidity": ["humidity", "humid", "60-80%"],
-            "soil": ["clay", "alkaline", "ph 7.0-8.0"],
-            "frost": ["november", "march", "freeze", "frost"],
-            "heat": ["summer", "90-100°f", "heat", "hot"]
-        }
-        
-        for i, query in enumerate(test_queries):
+        def check(item):
+            query_key, query, expected = item
             try:
                 data = {"message": query}
-                response = requests.post(f"{self.base_url}/chat", json=data, timeout=30)
+                response = self.session.post(f"{self.base_url}/chat", json=data, timeout=30)
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = orjson.loads(response.content)
                     response_text = result.get("response", "")
                     
-                    # Get the expected indicators for this query
-                    query_key = list(expected_indicators.keys())[i]
-                    expected = expected_indicators[query_key]
-                    
                     # Check if expected indicators are present
+                    text_lower = response_text.lower()
                     found_indicators = [indicator for indicator in expected 
-                                      if indicator in response_text.lower()]
+                                      if indicator in text_lower]
                     
                     if len(found_indicators) >= 1:
                         self.log_test(f"Specific Indicator - {query_key}", "PASS", 
@@ -239,10 +324,10 @@ class HoustonClimateTest:
                     self.log_test(f"Specific Indicator - {query_key}", "FAIL", 
                                 f"Status code: {response.status_code}")
                 
-                time.sleep(1)  # Rate limiting consideration
-                
             except Exception as e:
                 self.log_test(f"Specific Indicator - {query_key}", "FAIL", f"Error: {str(e)}")
+        
+        self._run_concurrently(check, SPECIFIC_INDICATOR_QUERIES)
     
     def test_climate_context_consistency(self):
         """Test that climate context is consistent across different query types."""
@@ -254,18 +339,17 @@ class HoustonClimateTest:
             ("/api/weather", {}, "GET")
         ]
         
-        responses = []
-        
-        for endpoint, data, method in endpoints:
+        def check(item):
+            """Return (endpoint, response text), or None if the request failed."""
+            endpoint, data, method = item
             try:
-                if method == "GET":
-                    response = requests.get(f"{self.base_url}{endpoint}", timeout=30)
+                if endpoint == "/api/weather":
+                    # Same forecast the weather mode test already fetched
+                    status_code, result = self.weather_response
                 else:
-                    response = requests.post(f"{self.base_url}{endpoint}", json=data, timeout=30)
+                    status_code, result = self._request_json(method, endpoint, data)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    
+                if status_code == 200:
                     if endpoint == "/api/weather":
                         # For weather endpoint, check plant care advice
                         plant_care_advice = result.get("plant_care_advice", [])
@@ -273,28 +357,28 @@ class HoustonClimateTest:
                     else:
                         response_text = result.get("response", "")
                     
-                    responses.append(response_text)
-                    
-                    context_found, found_indicators, total_indicators = self.check_houston_context(response_text)
-                    categories_found = sum(context_found.values())
-                    
-                    self.log_test(f"Climate Consistency - {endpoint}", "PASS", 
-                                f"Houston context found ({categories_found} categories)")
+                    return endpoint, response_text
                         
                 else:
                     self.log_test(f"Climate Consistency - {endpoint}", "FAIL", 
-                                f"Status code: {response.status_code}")
-                
-                time.sleep(1)  # Rate limiting consideration
+                                f"Status code: {status_code}")
                 
             except Exception as e:
                 self.log_test(f"Climate Consistency - {endpoint}", "FAIL", f"Error: {str(e)}")
+            return None
+        
+        collected = [item for item in self._run_concurrently(check, endpoints) if item is not None]
+        responses = [text for _, text in collected]
+        
+        # Score every collected response in one batch
+        for (endpoint, _), context_found in zip(collected, self.score_responses(responses)):
+            self.log_test(f"Climate Consistency - {endpoint}", "PASS", 
+                        f"Houston context found ({context_found.bit_count()} categories)")
         
         # Check if responses are consistent
         if len(responses) >= 2:
             # Simple consistency check - both should mention Houston or Texas
-            houston_mentions = [1 if "houston" in resp.lower() or "texas" in resp.lower() 
-                              else 0 for resp in responses]
+            houston_mentions = [1 if _HOUSTON_RE.search(resp) else 0 for resp in responses]
             
             if sum(houston_mentions) >= 1:
                 self.log_test("Climate Context Consistency", "PASS", 
@@ -308,7 +392,7 @@ class HoustonClimateTest:
         print("=" * 60)
         print("GardenLLM Houston Climate Context Test")
         print("=" * 60)
-        print(f"Starting tests at: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Starting tests at: {self.start_time.strftime(TIMESTAMP_FORMAT)}")
         print(f"Testing against: {self.base_url}")
         print("-" * 60)
         
@@ -321,12 +405,27 @@ class HoustonClimateTest:
             self.test_climate_context_consistency
         ]
         
-        for test in tests:
+        def run_test(test):
             try:
                 test()
             except Exception as e:
                 self.log_test(test.__name__, "ERROR", f"Test execution error: {str(e)}")
         
+        self._log_fp = open(self._results_filename("jsonl"), 'wb')
+        self._request_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+        try:
+            # The tests are independent, so run them side by side; their requests all
+            # go through the shared request pool, which bounds the load on the server
+            with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+                list(executor.map(run_test, tests))
+        finally:
+            self._log_fp.close()
+            self._log_fp = None
+            # All requests are done (or the run died); release the worker threads and pooled connections
+            self._request_pool.shutdown()
+            self._request_pool = None
+            self.session.close()
+        
         # Generate summary
         end_time = datetime.now()
         duration = end_time - self.start_time
@@ -350,10 +449,14 @@ class HoustonClimateTest:
         
         return passed, failed, warnings
     
+    def _results_filename(self, extension):
+        """Return the results file name for this run with the given extension."""
+        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
+        return f"houston_climate_test_results_{timestamp}.{extension}"
+    
     def save_results(self):
         """Save test results to file."""
-        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
-        filename = f"houston_climate_test_results_{timestamp}.json"
+        filename = self._results_filename("json")
         
         results = {
             "test_run": {
@@ -364,8 +467,9 @@ class HoustonClimateTest:
             "results": self.test_results
         }
         
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2)
+        # Write the encoded bytes directly, skipping the text-mode encode
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
         
         print(f"Detailed results saved to: {filename}")
 
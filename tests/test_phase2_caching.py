@@ -10,13 +10,34 @@ Date: December 2024
 
 import unittest
 import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch, MagicMock
-from plant_operations import (
-    get_plant_names_from_database,
-    invalidate_plant_list_cache,
-    get_plant_list_cache_info,
-    _plant_list_cache
-)
+
+def setUpModule():
+    """Import plant_operations when the tests run rather than at collection time,
+    since it pulls in the Google API client and the Sheets connection"""
+    global get_plant_names_from_database, invalidate_plant_list_cache, get_plant_list_cache_info
+    global get_plant_names_lower, get_plant_name_index, _plant_list_cache, HEADER_RANGE, DATA_RANGE
+    from plant_operations import (
+        get_plant_names_from_database,
+        invalidate_plant_list_cache,
+        get_plant_list_cache_info,
+        get_plant_names_lower,
+        get_plant_name_index,
+        _plant_list_cache,
+        HEADER_RANGE,
+        DATA_RANGE
+    )
+
+_SHEETS_HEADER = ['ID', 'Plant Name', 'Location', 'Description']
+
+def _batch_get_response(rows, header=_SHEETS_HEADER):
+    """Mock a Sheets batchGet result with header as the header range and rows as the data range"""
+    mock_response = Mock()
+    mock_response.execute.return_value = {
+        'valueRanges': [{'values': [header]}, {'values': rows}]
+    }
+    return mock_response
 
 class TestPlantListCaching(unittest.TestCase):
     """Test cases for the Plant List Caching system"""
@@ -24,8 +45,10 @@ class TestPlantListCaching(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures"""
         # Reset cache before each test
-        _plant_list_cache['names'] = []
-        _plant_list_cache['last_updated'] = 0
+        _plant_list_cache.names = ()
+        _plant_list_cache.names_lower = ()
+        _plant_list_cache.names_lower_sorted = ()
+        _plant_list_cache.last_updated = 0
 
     def test_cache_initialization(self):
         """Test that cache is properly initialized"""
@@ -39,8 +62,8 @@ class TestPlantListCaching(unittest.TestCase):
     def test_cache_invalidation(self):
         """Test cache invalidation functionality"""
         # Set up some cached data
-        _plant_list_cache['names'] = ['tomato', 'basil']
-        _plant_list_cache['last_updated'] = time.time()
+        _plant_list_cache.names = ('tomato', 'basil')
+        _plant_list_cache.last_updated = time.monotonic()
         
         # Verify cache is valid
         cache_info = get_plant_list_cache_info()
@@ -60,16 +83,11 @@ class TestPlantListCaching(unittest.TestCase):
     def test_fetch_plant_names_from_database(self, mock_rate_limit, mock_sheets):
         """Test fetching plant names from database"""
         # Mock successful database response
-        mock_response = Mock()
-        mock_response.execute.return_value = {
-            'values': [
-                ['ID', 'Plant Name', 'Location', 'Description'],  # Header row
-                ['1', 'Tomato', 'Front Garden', 'Red tomatoes'],
-                ['2', 'Basil', 'Back Patio', 'Sweet basil'],
-                ['3', 'Rose', 'Side Yard', 'Pink roses']
-            ]
-        }
-        mock_sheets.return_value.get.return_value = mock_response
+        mock_sheets.return_value.batchGet.return_value = _batch_get_response([
+            ['1', 'Tomato', 'Front Garden', 'Red tomatoes'],
+            ['2', 'Basil', 'Back Patio', 'Sweet basil'],
+            ['3', 'Rose', 'Side Yard', 'Pink roses']
+        ])
         
         # Fetch plant names
         plant_names = get_plant_names_from_database()
@@ -80,6 +98,11 @@ class TestPlantListCaching(unittest.TestCase):
         self.assertIn('Basil', plant_names)
         self.assertIn('Rose', plant_names)
         
+        # Verify header and rows came back in a single batchGet
+        mock_sheets.return_value.batchGet.assert_called_once()
+        self.assertEqual(mock_sheets.return_value.batchGet.call_args.kwargs['ranges'], [HEADER_RANGE, DATA_RANGE])
+        mock_sheets.return_value.get.assert_not_called()
+        
         # Verify cache was updated
         cache_info = get_plant_list_cache_info()
         self.assertTrue(cache_info['is_valid'])
@@ -90,15 +113,10 @@ class TestPlantListCaching(unittest.TestCase):
     def test_cache_usage_on_subsequent_calls(self, mock_rate_limit, mock_sheets):
         """Test that subsequent calls use cached data"""
         # Mock successful database response
-        mock_response = Mock()
-        mock_response.execute.return_value = {
-            'values': [
-                ['ID', 'Plant Name', 'Location', 'Description'],
-                ['1', 'Tomato', 'Front Garden', 'Red tomatoes'],
-                ['2', 'Basil', 'Back Patio', 'Sweet basil']
-            ]
-        }
-        mock_sheets.return_value.get.return_value = mock_response
+        mock_sheets.return_value.batchGet.return_value = _batch_get_response([
+            ['1', 'Tomato', 'Front Garden', 'Red tomatoes'],
+            ['2', 'Basil', 'Back Patio', 'Sweet basil']
+        ])
         
         # First call - should fetch from database
         plant_names1 = get_plant_names_from_database()
@@ -109,46 +127,125 @@ class TestPlantListCaching(unittest.TestCase):
         self.assertEqual(len(plant_names2), 2)
         
         # Verify database was only called once
-        mock_sheets.return_value.get.assert_called_once()
+        mock_sheets.return_value.batchGet.assert_called_once()
+
+    @patch('plant_operations.sheets_client.values')
+    @patch('plant_operations.check_rate_limit')
+    def test_single_flight_under_concurrency(self, mock_rate_limit, mock_sheets):
+        """Test that concurrent cache misses share a single database fetch"""
+        mock_response = _batch_get_response([
+            ['1', 'Tomato'],
+            ['2', 'Basil']
+        ])
+        slow_result = mock_response.execute.return_value
+        
+        def slow_execute():
+            time.sleep(0.05)  # Keep the fetch in flight while the other callers miss
+            return slow_result
+        mock_response.execute.side_effect = slow_execute
+        mock_sheets.return_value.batchGet.return_value = mock_response
+        
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(lambda _: get_plant_names_from_database(), range(16)))
+        
+        # Every caller got the same snapshot from one Sheets call
+        self.assertEqual(mock_sheets.return_value.batchGet.call_count, 1)
+        self.assertTrue(all(result == ('Tomato', 'Basil') for result in results))
 
     @patch('plant_operations.sheets_client.values')
     @patch('plant_operations.check_rate_limit')
     def test_cache_expiration(self, mock_rate_limit, mock_sheets):
         """Test that cache expires after the configured duration"""
         # Mock successful database response
-        mock_response = Mock()
-        mock_response.execute.return_value = {
-            'values': [
-                ['ID', 'Plant Name', 'Location', 'Description'],
-                ['1', 'Tomato', 'Front Garden', 'Red tomatoes']
-            ]
-        }
-        mock_sheets.return_value.get.return_value = mock_response
+        mock_sheets.return_value.batchGet.return_value = _batch_get_response([
+            ['1', 'Tomato', 'Front Garden', 'Red tomatoes']
+        ])
         
         # First call - should fetch from database
-        plant_names1 = get_plant_names_from_database()
+        with patch('plant_operations.time.monotonic', return_value=1000.0):
+            plant_names1 = get_plant_names_from_database()
         self.assertEqual(len(plant_names1), 1)
         
-        # Manually expire cache by setting last_updated to old time
-        _plant_list_cache['last_updated'] = time.time() - 400  # 400 seconds ago (older than 300s cache)
-        
-        # Second call - should fetch from database again due to expiration
-        plant_names2 = get_plant_names_from_database()
+        # Second call 400 seconds later (older than the 300s cache) - should fetch again due to expiration
+        with patch('plant_operations.time.monotonic', return_value=1400.0):
+            plant_names2 = get_plant_names_from_database()
         self.assertEqual(len(plant_names2), 1)
         
         # Verify database was called twice
-        self.assertEqual(mock_sheets.return_value.get.call_count, 2)
+        self.assertEqual(mock_sheets.return_value.batchGet.call_count, 2)
+
+    @patch('plant_operations.sheets_client.values')
+    @patch('plant_operations.check_rate_limit')
+    def test_lowercase_index_rebuilt_on_refresh(self, mock_rate_limit, mock_sheets):
+        """Test that the lowercased name index is rebuilt with every fresh fetch"""
+        mock_sheets.return_value.batchGet.return_value = _batch_get_response([
+            ['1', 'Tomato'],
+            ['2', 'Sweet Basil']
+        ])
+        plant_names = get_plant_names_from_database()
+        self.assertEqual(get_plant_names_lower(plant_names), ('tomato', 'sweet basil'))
+        
+        # Refresh after invalidation with different data
+        invalidate_plant_list_cache()
+        mock_sheets.return_value.batchGet.return_value = _batch_get_response([
+            ['1', 'Rose']
+        ])
+        plant_names = get_plant_names_from_database()
+        self.assertEqual(get_plant_names_lower(plant_names), ('rose',))
+        self.assertIs(get_plant_names_lower(plant_names), _plant_list_cache.names_lower)
+        
+        # Names that are not the cached snapshot are lowercased on demand
+        self.assertEqual(get_plant_names_lower(['Fig', 'Olive Tree']), ('fig', 'olive tree'))
+
+    @patch('plant_operations.sheets_client.values')
+    @patch('plant_operations.check_rate_limit')
+    def test_name_index_rebuilt_on_refresh(self, mock_rate_limit, mock_sheets):
+        """Test that the sorted name index is rebuilt with every fresh fetch"""
+        mock_sheets.return_value.batchGet.return_value = _batch_get_response([
+            ['1', 'Cherry Tomato'],
+            ['2', 'Basil']
+        ])
+        plant_names = get_plant_names_from_database()
+        self.assertEqual(get_plant_name_index(plant_names), (
+            ('basil', 'basil'),
+            ('cherry tomato', 'cherry tomato'),
+            ('tomato', 'cherry tomato')
+        ))
+        
+        invalidate_plant_list_cache()
+        mock_sheets.return_value.batchGet.return_value = _batch_get_response([
+            ['1', 'Rose']
+        ])
+        plant_names = get_plant_names_from_database()
+        self.assertEqual(get_plant_name_index(plant_names), (('rose', 'rose'),))
+        self.assertIs(get_plant_name_index(plant_names), _plant_list_cache.names_lower_sorted)
+
+    def test_name_index_prefix_matching(self):
+        """Test bisect prefix matching of queries against the name index"""
+        from query_analyzer import _find_plant_matches
+        index = get_plant_name_index(['Cherry Tomato', 'Tomato', 'Rose', 'Rosemary', 'Primrose', 'Basil'])
+        
+        # Plant names inside the query, anchored at word starts
+        self.assertEqual(_find_plant_matches('where are my roses?', index), {'rose'})
+        self.assertEqual(_find_plant_matches('water the cherry tomato and rosemary', index),
+                         {'cherry tomato', 'tomato', 'rosemary', 'rose'})
+        # Query inside a plant name, at the start of any of its words
+        self.assertEqual(_find_plant_matches('tomato', index), {'tomato', 'cherry tomato'})
+        self.assertEqual(_find_plant_matches('ros', index), {'rose', 'rosemary'})
+        # No matches
+        self.assertEqual(_find_plant_matches('how hot is it today', index), set())
+        self.assertEqual(_find_plant_matches('', index), set())
 
     @patch('plant_operations.sheets_client.values')
     @patch('plant_operations.check_rate_limit')
     def test_database_error_fallback_to_cache(self, mock_rate_limit, mock_sheets):
         """Test that database errors fall back to cached data"""
         # First, populate cache with some data
-        _plant_list_cache['names'] = ['Cached Tomato', 'Cached Basil']
-        _plant_list_cache['last_updated'] = time.time()
+        _plant_list_cache.names = ('Cached Tomato', 'Cached Basil')
+        _plant_list_cache.last_updated = time.monotonic()
         
         # Mock database error
-        mock_sheets.return_value.get.side_effect = Exception("Database error")
+        mock_sheets.return_value.batchGet.side_effect = Exception("Database error")
         
         # Call should return cached data
         plant_names = get_plant_names_from_database()
@@ -163,11 +260,7 @@ class TestPlantListCaching(unittest.TestCase):
     def test_empty_database_handling(self, mock_rate_limit, mock_sheets):
         """Test handling of empty database"""
         # Mock empty database response
-        mock_response = Mock()
-        mock_response.execute.return_value = {
-            'values': [['ID', 'Plant Name', 'Location', 'Description']]  # Only header
-        }
-        mock_sheets.return_value.get.return_value = mock_response
+        mock_sheets.return_value.batchGet.return_value = _batch_get_response([])  # Only header
         
         # Fetch plant names
         plant_names = get_plant_names_from_database()
@@ -184,15 +277,10 @@ class TestPlantListCaching(unittest.TestCase):
     def test_missing_plant_name_column(self, mock_rate_limit, mock_sheets):
         """Test handling when Plant Name column is missing"""
         # Mock response without Plant Name column
-        mock_response = Mock()
-        mock_response.execute.return_value = {
-            'values': [
-                ['ID', 'Location', 'Description'],  # No Plant Name column
-                ['1', 'Front Garden', 'Red tomatoes'],
-                ['2', 'Back Patio', 'Sweet basil']
-            ]
-        }
-        mock_sheets.return_value.get.return_value = mock_response
+        mock_sheets.return_value.batchGet.return_value = _batch_get_response([
+            ['1', 'Front Garden', 'Red tomatoes'],
+            ['2', 'Back Patio', 'Sweet basil']
+        ], header=['ID', 'Location', 'Description'])  # No Plant Name column
         
         # Fetch plant names
         plant_names = get_plant_names_from_database()
@@ -203,8 +291,8 @@ class TestPlantListCaching(unittest.TestCase):
     def test_cache_info_accuracy(self):
         """Test that cache info provides accurate information"""
         # Set up cache with known data
-        _plant_list_cache['names'] = ['Plant1', 'Plant2', 'Plant3']
-        _plant_list_cache['last_updated'] = time.time()
+        _plant_list_cache.names = ('Plant1', 'Plant2', 'Plant3')
+        _plant_list_cache.last_updated = time.monotonic()
         
         cache_info = get_plant_list_cache_info()
         
@@ -212,22 +300,33 @@ class TestPlantListCaching(unittest.TestCase):
         self.assertTrue(cache_info['is_valid'])
         self.assertGreaterEqual(cache_info['cache_age_seconds'], 0)
         self.assertLess(cache_info['cache_age_seconds'], 1)  # Should be very recent
+        
+        # Validity flips exactly at the TTL, measured on the monotonic clock
+        # (exactly representable readings, so the age is never rounded under the TTL)
+        last_updated = 1000.0
+        _plant_list_cache.last_updated = last_updated
+        with patch('plant_operations.time.monotonic', return_value=last_updated + 299):
+            self.assertTrue(get_plant_list_cache_info()['is_valid'])
+        with patch('plant_operations.time.monotonic', return_value=last_updated + 300):
+            self.assertFalse(get_plant_list_cache_info()['is_valid'])
 
-    def test_cache_copy_return(self):
-        """Test that cache returns a copy, not the original list"""
+    def test_cache_immutable_return(self):
+        """Test that cache returns an immutable snapshot callers cannot modify"""
         # Set up cache
-        _plant_list_cache['names'] = ['Original Plant']
-        _plant_list_cache['last_updated'] = time.time()
+        _plant_list_cache.names = ('Original Plant',)
+        _plant_list_cache.last_updated = time.monotonic()
         
         # Get plant names
         plant_names = get_plant_names_from_database()
         
-        # Modify the returned list
-        plant_names.append('Modified Plant')
+        # The snapshot cannot be modified in place
+        with self.assertRaises(AttributeError):
+            plant_names.append('Modified Plant')
         
-        # Verify original cache is unchanged
-        self.assertEqual(len(_plant_list_cache['names']), 1)
-        self.assertNotIn('Modified Plant', _plant_list_cache['names'])
+        # A caller's own copy can be modified without touching the cache
+        own_copy = list(plant_names)
+        own_copy.append('Modified Plant')
+        self.assertEqual(_plant_list_cache.names, ('Original Plant',))
 
 if __name__ == '__main__':
     # Run the tests
@@ -10,9 +10,11 @@ into the chat response system, including:
 """
 
 import unittest
+from contextlib import contextmanager
 from unittest.mock import patch, MagicMock
 import sys
 import os
+from datetime import timedelta
 
 # Add the parent directory to the path to import modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -26,6 +28,13 @@ from chat_response import (
 from conversation_manager import ConversationManager
 from query_analyzer import QueryType
 
+@contextmanager
+def patch_openai(**kwargs):
+    """Patch the chat response and query analyzer OpenAI calls with one shared mock"""
+    with patch('chat_response._openai_create', **kwargs) as mock_openai, \
+            patch('query_analyzer.openai_client.chat.completions.create', new=mock_openai):
+        yield mock_openai
+
 class TestPhase2ConversationIntegration(unittest.TestCase):
     """Test conversation history integration in chat response system"""
     
@@ -49,7 +58,7 @@ class TestPhase2ConversationIntegration(unittest.TestCase):
     
     def test_conversation_id_parameter_accepted(self):
         """Test that conversation_id parameter is properly accepted"""
-        with patch('chat_response.openai_client.chat.completions.create', return_value=self.mock_openai_response):
+        with patch_openai(return_value=self.mock_openai_response):
             response = get_chat_response_with_analyzer_optimized(
                 "What plants do I have?", 
                 conversation_id=self.test_conversation_id
@@ -59,7 +68,7 @@ class TestPhase2ConversationIntegration(unittest.TestCase):
     
     def test_conversation_messages_stored(self):
         """Test that conversation messages are properly stored"""
-        with patch('chat_response.openai_client.chat.completions.create', return_value=self.mock_openai_response):
+        with patch_openai(return_value=self.mock_openai_response):
             # Send first message
             get_chat_response_with_analyzer_optimized(
                 "What plants do I have?", 
@@ -68,15 +77,21 @@ class TestPhase2ConversationIntegration(unittest.TestCase):
             
             # Check that messages were stored
             messages = get_conversation_manager().get_messages(self.test_conversation_id)
+            self.assertIsInstance(messages, tuple)  # Read-only snapshot, not a copied list
             self.assertEqual(len(messages), 2)  # User message + AI response
             self.assertEqual(messages[0]["role"], "user")
             self.assertEqual(messages[0]["content"], "What plants do I have?")
             self.assertEqual(messages[1]["role"], "assistant")
             self.assertEqual(messages[1]["content"], "Test AI response")
+            
+            # Repeat reads share the snapshot until the conversation changes
+            self.assertIs(get_conversation_manager().get_messages(self.test_conversation_id), messages)
+            get_conversation_manager().add_message(self.test_conversation_id, {"role": "user", "content": "Follow-up"})
+            self.assertEqual(len(get_conversation_manager().get_messages(self.test_conversation_id)), 3)
     
     def test_conversation_context_preserved(self):
         """Test that conversation context is preserved across multiple messages"""
-        with patch('chat_response.openai_client.chat.completions.create', return_value=self.mock_openai_response):
+        with patch_openai(return_value=self.mock_openai_response):
             # Send first message
             get_chat_response_with_analyzer_optimized(
                 "I have a tomato plant", 
@@ -99,7 +114,7 @@ class TestPhase2ConversationIntegration(unittest.TestCase):
     
     def test_ai_response_with_conversation_history(self):
         """Test that AI responses include conversation history context"""
-        with patch('chat_response.openai_client.chat.completions.create') as mock_openai:
+        with patch_openai() as mock_openai:
             mock_openai.return_value = self.mock_openai_response
             
             # Send first message
@@ -130,7 +145,7 @@ class TestPhase2ConversationIntegration(unittest.TestCase):
     
     def test_conversation_id_optional(self):
         """Test that conversation_id is optional and doesn't break existing functionality"""
-        with patch('chat_response.openai_client.chat.completions.create', return_value=self.mock_openai_response):
+        with patch_openai(return_value=self.mock_openai_response):
             # Test without conversation_id
             response = get_chat_response_with_analyzer_optimized("What plants do I have?")
             self.assertIsInstance(response, str)
@@ -154,7 +169,7 @@ class TestPhase2ConversationIntegration(unittest.TestCase):
     
     def test_handle_ai_enhanced_query_with_conversation(self):
         """Test that handle_ai_enhanced_query_optimized supports conversation history"""
-        with patch('chat_response.openai_client.chat.completions.create', return_value=self.mock_openai_response):
+        with patch_openai(return_value=self.mock_openai_response):
             response = handle_ai_enhanced_query_optimized(
                 QueryType.CARE,
                 ["tomato"],
@@ -165,7 +180,7 @@ class TestPhase2ConversationIntegration(unittest.TestCase):
     
     def test_generate_ai_response_with_conversation_context(self):
         """Test that generate_ai_response_with_context includes conversation history"""
-        with patch('chat_response.openai_client.chat.completions.create') as mock_openai:
+        with patch_openai() as mock_openai:
             mock_openai.return_value = self.mock_openai_response
             
             # Add some conversation history first
@@ -215,6 +230,22 @@ class TestPhase2ConversationIntegration(unittest.TestCase):
         # Verify conversation is cleared on timeout
         messages = get_conversation_manager().get_messages(self.test_conversation_id)
         self.assertEqual(len(messages), 0)
+        self.assertNotIn(self.test_conversation_id, get_conversation_manager().conversations)
+    
+    def test_expired_conversations_reaped_from_heap(self):
+        """Test that idle conversations are evicted from the expiry heap without a full sweep"""
+        manager = get_conversation_manager()
+        for i in range(5):
+            manager.add_message(f"idle_{i}", {"role": "user", "content": "Test message"})
+        
+        # With a zero timeout every earlier heap entry is overdue on the next call
+        with patch.object(manager, 'conversation_timeout', timedelta(0)):
+            manager.add_message(self.test_conversation_id, {"role": "user", "content": "Test message"})
+            self.assertEqual(set(manager.conversations), {self.test_conversation_id})
+        
+        # Only the live conversation's entry is left to pop
+        self.assertEqual([entry[1] for entry in manager._expiry_heap], [self.test_conversation_id])
+        self.assertEqual(len(manager.get_messages(self.test_conversation_id)), 1)
     
     def test_token_management_with_conversation(self):
         """Test that token management works with conversation history"""
@@ -231,7 +262,7 @@ class TestPhase2ConversationIntegration(unittest.TestCase):
     
     def test_error_handling_with_conversation(self):
         """Test that errors are handled gracefully with conversation history"""
-        with patch('chat_response.openai_client.chat.completions.create', side_effect=Exception("API Error")):
+        with patch_openai(side_effect=Exception("API Error")):
             # Should not crash even with conversation_id
             try:
                 response = get_chat_response_with_analyzer_optimized(
@@ -13,7 +13,7 @@ This test suite verifies the Phase 3 backend enhancements including:
 import unittest
 import json
 import time
-from unittest.mock import patch, MagicMock
+from datetime import datetime, timedelta
 import os
 import sys
 
@@ -21,21 +21,29 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from conversation_manager import ConversationManager
-from chat_response import get_chat_response_with_analyzer_optimized
-from plant_vision import analyze_plant_image
+import chat_response
+import plant_vision
+
+# Minimal valid 1x1 JPEG (JFIF) image for the plant vision tests
+_MIN_JPEG = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x01\x00H\x00H\x00\x00\xff\xdb\x00C\x00\x08\x06\x06\x07\x06\x05\x08\x07\x07\x07\t\t\x08\n\x0c\x14\r\x0c\x0b\x0b\x0c\x19\x12\x13\x0f\x14\x1d\x1a\x1f\x1e\x1d\x1a\x1c\x1c $.\' ",#\x1c\x1c(7),01444\x1f\'9=82<.342\xff\xc0\x00\x11\x08\x00\x01\x00\x01\x01\x01\x11\x00\x02\x11\x01\x03\x11\x01\xff\xc4\x00\x14\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x08\xff\xc4\x00\x14\x10\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\xda\x00\x0c\x03\x01\x00\x02\x11\x03\x11\x00\x3f\x00\xaa\xff\xd9'
 
 
 class Phase3BackendEnhancementTests(unittest.TestCase):
     """Test suite for Phase 3 backend enhancements"""
     
-    def setUp(self):
-        """Set up test environment"""
+    @classmethod
+    def setUpClass(cls):
+        """Create one conversation manager for the whole suite"""
         print(f"\n{'='*60}")
-        print(f"Phase 3 Backend Enhancement Test: {self._testMethodName}")
+        print("Phase 3 Backend Enhancement Tests")
         print(f"{'='*60}")
-        
-        # Initialize conversation manager
-        self.conversation_manager = ConversationManager()
+        cls.shared_conversation_manager = ConversationManager()
+    
+    def setUp(self):
+        """Set up test environment"""
+        # Reuse the suite's conversation manager, emptied so each test starts with no conversations
+        self.conversation_manager = self.shared_conversation_manager
+        self.conversation_manager.clear_all_conversations()
     
     def test_conversation_id_preservation_across_modes(self):
         """Test that conversation ID is preserved when switching between modes"""
@@ -227,21 +235,31 @@ class Phase3BackendEnhancementTests(unittest.TestCase):
         """Test conversation timeout handling"""
         print("Testing conversation timeout handling...")
         
-        conversation_id = self.conversation_manager.generate_conversation_id()
+        # A manager on a fake clock, so the timeout passes without any real waiting
+        clock = [datetime(2024, 12, 1, 9, 0)]
+        conversation_manager = ConversationManager(clock=lambda: clock[0])
+        conversation_id = conversation_manager.generate_conversation_id()
         
         # Add message
-        self.conversation_manager.add_message(conversation_id, {
+        conversation_manager.add_message(conversation_id, {
             'role': 'user',
             'content': 'Test message'
         })
         
         # Verify conversation exists
-        messages = self.conversation_manager.get_messages(conversation_id)
+        messages = conversation_manager.get_messages(conversation_id)
         self.assertEqual(len(messages), 1)
         
-        # Test timeout cleanup (simulate old conversation)
-        # Note: This would require modifying the conversation manager to support timeout testing
-        # For now, we'll just verify the conversation manager handles the request properly
+        # Still active right up to the timeout
+        clock[0] += conversation_manager.conversation_timeout - timedelta(seconds=1)
+        self.assertEqual(conversation_manager.cleanup_expired_conversations(), 0)
+        self.assertEqual(len(conversation_manager.get_messages(conversation_id)), 1)
+        
+        # Past the timeout the conversation is cleaned up
+        clock[0] += conversation_manager.conversation_timeout + timedelta(seconds=1)
+        self.assertEqual(conversation_manager.cleanup_expired_conversations(), 1)
+        self.assertEqual(conversation_manager.get_messages(conversation_id), ())
+        self.assertNotIn(conversation_id, conversation_manager.conversations)
         
         print("PASS: Conversation timeout handling test passed")
     
@@ -252,8 +270,8 @@ class Phase3BackendEnhancementTests(unittest.TestCase):
         # Test with invalid conversation ID
         try:
             messages = self.conversation_manager.get_messages("invalid_id")
-            # Should return empty list or handle gracefully
-            self.assertIsInstance(messages, list)
+            # Should return an empty tuple or handle gracefully
+            self.assertIsInstance(messages, tuple)
         except Exception as e:
             # If exception is raised, it should be handled gracefully
             self.fail(f"Exception should be handled gracefully: {e}")
@@ -262,7 +280,7 @@ class Phase3BackendEnhancementTests(unittest.TestCase):
         try:
             messages = self.conversation_manager.get_messages("")
             # Should handle empty string gracefully
-            self.assertIsInstance(messages, list)
+            self.assertIsInstance(messages, tuple)
         except Exception as e:
             # If exception is raised, it should be handled gracefully
             self.fail(f"Exception should be handled gracefully: {e}")
@@ -283,9 +301,8 @@ class Phase3BackendEnhancementTests(unittest.TestCase):
         self.assertEqual(len(conversation_ids), 10)
         
         # Verify ID format consistency
-        for conversation_id in conversation_ids:
-            self.assertTrue('_' in conversation_id)
-            self.assertTrue(len(conversation_id) > 10)
+        malformed = [cid for cid in conversation_ids if '_' not in cid or len(cid) <= 10]
+        self.assertEqual(malformed, [])
         
         print("PASS: Conversation ID uniqueness test passed")
     
@@ -301,12 +318,14 @@ class Phase3BackendEnhancementTests(unittest.TestCase):
             conversation_id = self.conversation_manager.generate_conversation_id()
             conversation_ids.append(conversation_id)
             
-            # Add multiple messages to each conversation
-            for j in range(5):
-                self.conversation_manager.add_message(conversation_id, {
+            # Add multiple messages to each conversation in one batch
+            self.conversation_manager.add_messages(conversation_id, [
+                {
                     'role': 'user' if j % 2 == 0 else 'assistant',
                     'content': f'Message {j} in conversation {i}'
-                })
+                }
+                for j in range(5)
+            ])
         
         end_time = time.time()
         performance_time = end_time - start_time
@@ -315,9 +334,8 @@ class Phase3BackendEnhancementTests(unittest.TestCase):
         self.assertLess(performance_time, 1.0)
         
         # Verify all conversations are accessible
-        for conversation_id in conversation_ids:
-            messages = self.conversation_manager.get_messages(conversation_id)
-            self.assertEqual(len(messages), 5)
+        lengths = [len(self.conversation_manager.get_messages(cid)) for cid in conversation_ids]
+        self.assertEqual(lengths, [5] * 50)
         
         print("PASS: Conversation manager performance test passed")
     
@@ -330,15 +348,18 @@ class Phase3BackendEnhancementTests(unittest.TestCase):
         # Test that conversation ID is passed through chat response system
         test_message = "What plants do I have?"
         
-        # Mock the chat response to verify conversation ID handling
-        with patch('chat_response.get_chat_response_with_analyzer_optimized') as mock_chat:
-            mock_chat.return_value = "You have tomatoes and peppers in your garden."
-            
-            # Call the function directly to trigger the mock
-            response = mock_chat(test_message, conversation_id)
-            
-            # Verify the function was called with conversation ID
-            mock_chat.assert_called_once_with(test_message, conversation_id)
+        # Swap in a recording stub to verify conversation ID handling (restored after the test)
+        calls = []
+        self.addCleanup(setattr, chat_response, 'get_chat_response_with_analyzer_optimized',
+                        chat_response.get_chat_response_with_analyzer_optimized)
+        chat_response.get_chat_response_with_analyzer_optimized = \
+            lambda *args: (calls.append(args), "You have tomatoes and peppers in your garden.")[1]
+        
+        response = chat_response.get_chat_response_with_analyzer_optimized(test_message, conversation_id)
+        
+        # Verify the function was called once with conversation ID
+        self.assertEqual(calls, [(test_message, conversation_id)])
+        self.assertEqual(response, "You have tomatoes and peppers in your garden.")
         
         print("PASS: Integration with chat response system test passed")
     
@@ -348,24 +369,23 @@ class Phase3BackendEnhancementTests(unittest.TestCase):
         
         conversation_id = self.conversation_manager.generate_conversation_id()
         
-        # Create a valid test image data (minimal JPEG header)
-        test_image_data = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x01\x00H\x00H\x00\x00\xff\xdb\x00C\x00\x08\x06\x06\x07\x06\x05\x08\x07\x07\x07\t\t\x08\n\x0c\x14\r\x0c\x0b\x0b\x0c\x19\x12\x13\x0f\x14\x1d\x1a\x1f\x1e\x1d\x1a\x1c\x1c $.\' ",#\x1c\x1c(7),01444\x1f\'9=82<.342\xff\xc0\x00\x11\x08\x00\x01\x00\x01\x01\x01\x11\x00\x02\x11\x01\x03\x11\x01\xff\xc4\x00\x14\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x08\xff\xc4\x00\x14\x10\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\xda\x00\x0c\x03\x01\x00\x02\x11\x03\x11\x00\x3f\x00\xaa\xff\xd9'
-        
         # Test that conversation ID is passed through plant vision system
         test_message = "What plant is this?"
         
-        # Mock the plant vision system to verify conversation ID handling
-        with patch('plant_vision.analyze_plant_image') as mock_analyze:
-            mock_analyze.return_value = {
-                'response': 'This appears to be a tomato plant.',
-                'conversation_id': conversation_id
-            }
-            
-            # Call the function directly to trigger the mock
-            result = mock_analyze(test_image_data, test_message, conversation_id)
-            
-            # Verify the function was called with conversation ID
-            mock_analyze.assert_called_once()
+        # Swap in a recording stub to verify conversation ID handling (restored after the test)
+        calls = []
+        analysis = {
+            'response': 'This appears to be a tomato plant.',
+            'conversation_id': conversation_id
+        }
+        self.addCleanup(setattr, plant_vision, 'analyze_plant_image', plant_vision.analyze_plant_image)
+        plant_vision.analyze_plant_image = lambda *args: (calls.append(args), analysis)[1]
+        
+        result = plant_vision.analyze_plant_image(_MIN_JPEG, test_message, conversation_id)
+        
+        # Verify the function was called once with conversation ID
+        self.assertEqual(calls, [(_MIN_JPEG, test_message, conversation_id)])
+        self.assertEqual(result['conversation_id'], conversation_id)
         
         print("PASS: Integration with plant vision system test passed")
     
@@ -498,9 +518,8 @@ class Phase3BackendEnhancementTests(unittest.TestCase):
             })
         
         # Verify conversations exist
-        for conversation_id in conversation_ids:
-            messages = self.conversation_manager.get_messages(conversation_id)
-            self.assertEqual(len(messages), 1)
+        lengths = [len(self.conversation_manager.get_messages(cid)) for cid in conversation_ids]
+        self.assertEqual(lengths, [1, 1, 1])
         
         # Clear one conversation
         self.conversation_manager.clear_conversation(conversation_ids[0])
@@ -510,9 +529,8 @@ class Phase3BackendEnhancementTests(unittest.TestCase):
         self.assertEqual(len(messages), 0)
         
         # Verify others still exist
-        for conversation_id in conversation_ids[1:]:
-            messages = self.conversation_manager.get_messages(conversation_id)
-            self.assertEqual(len(messages), 1)
+        lengths = [len(self.conversation_manager.get_messages(cid)) for cid in conversation_ids[1:]]
+        self.assertEqual(lengths, [1, 1])
         
         print("PASS: Conversation cleanup functionality test passed")
 
@@ -145,7 +145,7 @@ class TestPhase4AIEnhancedQueries:
         """Test AI response generation for care queries"""
         context = "Location: Houston, Texas\nTomato: Light Requirements: Full sun"
         
-        with patch('chat_response.openai_client.chat.completions.create') as mock_openai:
+        with patch('chat_response._openai_create') as mock_openai:
             mock_response = MagicMock()
             mock_response.choices[0].message.content = "Water your tomato regularly and provide full sun exposure."
             mock_openai.return_value = mock_response
@@ -167,7 +167,7 @@ class TestPhase4AIEnhancedQueries:
         """Test AI response generation for diagnosis queries"""
         context = "Location: Houston, Texas\nBasil: Care Notes: Prone to fungal diseases"
         
-        with patch('chat_response.openai_client.chat.completions.create') as mock_openai:
+        with patch('chat_response._openai_create') as mock_openai:
             mock_response = MagicMock()
             mock_response.choices[0].message.content = "Yellow leaves could indicate overwatering or fungal disease."
             mock_openai.return_value = mock_response
@@ -189,7 +189,7 @@ class TestPhase4AIEnhancedQueries:
         """Test AI response generation error handling"""
         context = "Location: Houston, Texas"
         
-        with patch('chat_response.openai_client.chat.completions.create', side_effect=Exception("API Error")):
+        with patch('chat_response._openai_create', side_effect=Exception("API Error")):
             result = _generate_ai_response(QueryType.GENERAL, context, "Test question")
             
             assert "I'm sorry, I encountered an error" in result
@@ -242,7 +242,7 @@ class Phase4CrossModeFlowTests(unittest.TestCase):
         })
         
         # Mock the OpenAI client
-        with patch('chat_response.openai_client.chat.completions.create') as mock_openai:
+        with patch('chat_response._openai_create') as mock_openai:
             mock_response = MagicMock()
             mock_response.choices = [MagicMock()]
             mock_response.choices[0].message.content = "Based on your garden context, here's advice for your tomatoes..."
@@ -8,6 +8,7 @@ works correctly with real user queries through the main chat system.
 import sys
 import os
 import logging
+from contextlib import contextmanager
 from unittest.mock import patch, MagicMock
 
 # Add the parent directory to the path so we can import our modules
@@ -15,6 +16,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from chat_response import get_chat_response
 
+@contextmanager
+def patch_openai(**kwargs):
+    """Patch the chat response and query analyzer OpenAI calls with one shared mock"""
+    with patch('chat_response._openai_create', **kwargs) as mock_openai, \
+            patch('query_analyzer.openai_client.chat.completions.create', new=mock_openai):
+        yield mock_openai
+
 # Configure logging for tests
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,7 +45,7 @@ class TestPhase4Integration:
         ]
         
         with patch('chat_response.get_plant_data', return_value=mock_plant_data):
-            with patch('chat_response.openai_client.chat.completions.create') as mock_openai:
+            with patch_openai() as mock_openai:
                 mock_response = MagicMock()
                 mock_response.choices[0].message.content = "For your tomato in Houston's climate, provide full sun and water regularly. The heat tolerance will help during our hot summers."
                 mock_openai.return_value = mock_response
@@ -74,7 +82,7 @@ class TestPhase4Integration:
         ]
         
         with patch('chat_response.get_plant_data', return_value=mock_plant_data):
-            with patch('chat_response.openai_client.chat.completions.create') as mock_openai:
+            with patch_openai() as mock_openai:
                 mock_response = MagicMock()
                 mock_response.choices[0].message.content = "Yellow leaves on your basil could be due to overwatering or fungal disease, which is common in Houston's humid climate."
                 mock_openai.return_value = mock_response
@@ -112,7 +120,7 @@ class TestPhase4Integration:
         ]
         
         with patch('chat_response.get_plant_data', return_value=mock_plant_data):
-            with patch('chat_response.openai_client.chat.completions.create') as mock_openai:
+            with patch_openai() as mock_openai:
                 mock_response = MagicMock()
                 mock_response.choices[0].message.content = "For your lettuce in Houston, provide partial shade and consistent moisture. Harvest outer leaves to encourage new growth."
                 mock_openai.return_value = mock_response
@@ -148,7 +156,7 @@ class TestPhase4Integration:
         ]
         
         with patch('chat_response.get_plant_data', return_value=mock_plant_data):
-            with patch('chat_response.openai_client.chat.completions.create') as mock_openai:
+            with patch_openai() as mock_openai:
                 mock_response = MagicMock()
                 mock_response.choices[0].message.content = "Roses are beautiful flowering shrubs that thrive in Houston's climate. They need full sun and regular care."
                 mock_openai.return_value = mock_response
@@ -174,7 +182,7 @@ class TestPhase4Integration:
     def test_general_query_no_plants(self):
         """Test general query with no specific plants"""
         with patch('chat_response.get_plant_data', return_value=[]):
-            with patch('chat_response.openai_client.chat.completions.create') as mock_openai:
+            with patch_openai() as mock_openai:
                 mock_response = MagicMock()
                 mock_response.choices[0].message.content = "In Houston's climate, the best time to plant vegetables is in early spring (February-March) or fall (September-October)."
                 mock_openai.return_value = mock_response
@@ -205,7 +213,7 @@ class TestPhase4Integration:
                 return MagicMock(choices=[MagicMock(message=MagicMock(content="General information about plants"))])
         
         with patch('chat_response.get_plant_data', return_value=[{'Plant Name': 'Test Plant'}]):
-            with patch('chat_response.openai_client.chat.completions.create', side_effect=mock_openai_response):
+            with patch_openai(side_effect=mock_openai_response):
                 
                 # Test care query
                 care_result = get_chat_response("How do I care for my plants?")
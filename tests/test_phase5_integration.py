@@ -214,7 +214,7 @@ class TestPhase5Integration(unittest.TestCase):
         
         mock_get_plant_data.assert_called_once_with(['Sweet Basil'])
 
-    @patch('chat_response.openai_client.chat.completions.create')
+    @patch('chat_response._openai_create')
     def test_generate_ai_response_with_context(self, mock_openai):
         """Test AI response generation with context"""
         # Mock AI response
@@ -234,7 +234,7 @@ class TestPhase5Integration(unittest.TestCase):
         self.assertEqual(result, "Here's care advice for your basil in Houston.")
         mock_openai.assert_called_once()
 
-    @patch('chat_response.openai_client.chat.completions.create')
+    @patch('chat_response._openai_create')
     def test_generate_fallback_ai_response(self, mock_openai):
         """Test fallback AI response generation"""
         # Mock AI response
@@ -250,7 +250,7 @@ class TestPhase5Integration(unittest.TestCase):
         self.assertEqual(result, "I can help with your gardening question.")
         mock_openai.assert_called_once()
 
-    @patch('chat_response.openai_client.chat.completions.create')
+    @patch('chat_response._openai_create')
     def test_fallback_ai_response_failure(self, mock_openai):
         """Test fallback AI response when it also fails"""
         # Mock AI failure
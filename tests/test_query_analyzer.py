@@ -208,6 +208,54 @@ class TestQueryAnalyzer(unittest.TestCase):
         # Verify AI was called
         mock_openai.assert_called_once()
 
+    @patch('query_analyzer.openai_client.chat.completions.create')
+    def test_analyze_query_prefilter_skips_ai(self, mock_openai):
+        """Test that queries without plant names or query-type keywords skip the AI call"""
+        result = analyze_query("hello there", self.sample_plant_list)
+        
+        # Classified as GENERAL locally; the chat response is still AI-generated
+        mock_openai.assert_not_called()
+        self.assertEqual(result['query_type'], QueryType.GENERAL)
+        self.assertEqual(result['plant_references'], [])
+        self.assertTrue(result['requires_ai_response'])
+        self.assertEqual(result['original_query'], "hello there")
+        
+        # A plant name alone is enough to send the query to the AI
+        mock_openai.side_effect = Exception("AI API error")
+        analyze_query("tomatoes?", self.sample_plant_list)
+        mock_openai.assert_called_once()
+
+    @patch('plant_operations.get_plant_list_version', return_value=1)
+    @patch('query_analyzer.get_plant_list_from_database')
+    @patch('query_analyzer.openai_client.chat.completions.create')
+    def test_analyze_query_cached_per_plant_list_version(self, mock_openai, mock_plant_list, mock_version):
+        """Test that repeated analyses of a query reuse the result until the plant list changes"""
+        # The analysis reads the names the fetch left in the plant list cache
+        names_patch = patch('plant_operations._plant_list_cache.names', tuple(self.sample_plant_list))
+        names_patch.start()
+        self.addCleanup(names_patch.stop)
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = '{"plant_references": ["tomato"], "query_type": "LOCATION", "confidence": 0.9}'
+        mock_openai.return_value = mock_response
+        
+        first = analyze_query("Where are my tomatoes?")
+        first['plant_references'].append("mutated")
+        second = analyze_query("Where are my tomatoes?")
+        
+        # Second analysis came from the cache, unaffected by the caller's changes to the first
+        mock_openai.assert_called_once()
+        self.assertEqual(second['plant_references'], ["tomato"])
+        self.assertEqual(second['query_type'], QueryType.LOCATION)
+        
+        # A new plant list version re-analyzes
+        mock_version.return_value = 2
+        analyze_query("Where are my tomatoes?")
+        self.assertEqual(mock_openai.call_count, 2)
+        
+        # The plant list is fetched exactly once per analysis, cached or not
+        self.assertEqual(mock_plant_list.call_count, 3)
+
     @patch('query_analyzer.openai_client.chat.completions.create')
     def test_analyze_query_ai_failure(self, mock_openai):
         """Test query analysis when AI call fails"""
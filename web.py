@@ -20,7 +20,7 @@ from sheets_client import initialize_sheet
 from enhanced_weather_service import get_current_weather, get_hourly_forecast
 from field_config import get_all_field_names, get_field_alias, get_canonical_field_name
 from climate_config import get_climate_context, get_default_location
-from chat_response import get_chat_response_with_analyzer_optimized
+from chat_response import get_chat_response_with_analyzer_optimized, get_chat_route
 from conversation_manager import ConversationManager
 
 # Set up logging
@@ -524,6 +524,14 @@ def chat():
         if not message:
             return jsonify({'success': False, 'error': 'Message is required'}), 400
         
+        # Dry run: report the routed handler without generating a response or touching history
+        if data.get('dry_run'):
+            return jsonify({
+                'success': True,
+                'route': get_chat_route(message),
+                'conversation_id': conversation_id
+            })
+        
         # Use the optimized chat response function with conversation history
         response = get_chat_response_with_analyzer_optimized(message, conversation_id)
         
@@ -631,10 +639,7 @@ def api_conversation_history():
         conversations = conversation_manager.get_all_conversations()
         
         # Generate summaries for each conversation
-        history_summaries = []
-        for conversation_id in conversations.keys():
-            summary = conversation_manager.get_conversation_history_summary(conversation_id)
-            history_summaries.append(summary)
+        history_summaries = conversation_manager.bulk_get_summaries(list(conversations))
         
         # Sort by last activity (most recent first)
         history_summaries.sort(key=lambda x: x.get('last_activity', datetime.min), reverse=True)